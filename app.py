@@ -3,15 +3,35 @@ Dublin Trip App - The White Jersey
 A Streamlit mobile app for tracking Dublin trip activities.
 """
 
+import bisect
+import csv
+import difflib
+import hashlib
+import io
+import json
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import unicodedata
+import uuid
+import numpy as np
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+from PIL import Image
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from fractions import Fraction
 from typing import Optional
 from streamlit_gsheets import GSheetsConnection
 import cloudinary
 import cloudinary.uploader
 import time
 from googleapiclient.errors import HttpError
+from gspread.exceptions import WorksheetNotFound
 
 # =============================================================================
 # APP CONFIGURATION
@@ -491,6 +511,475 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# =============================================================================
+# TRIPS
+# =============================================================================
+
+# The original trip: its roster, admin and the un-prefixed worksheets of the
+# connection's spreadsheet. More trips are configured under [trips.<id>] in
+# secrets and chosen with ?trip=<id> in the URL.
+DEFAULT_TRIP_ID = "dublin-2025"
+USERS = ["JJ", "Henry", "James", "Dom", "Ash", "Max", "Gerard"]
+ADMIN_USER = "James"
+
+def setting_list(value) -> list:
+    """A list setting, splitting comma-separated strings (as set in the environment)."""
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return list(value or [])
+
+def get_trips() -> dict:
+    """All configured trips by id, the default trip first."""
+    trips = {
+        DEFAULT_TRIP_ID: {
+            "id": DEFAULT_TRIP_ID,
+            "name": "Dublin Racing Trip 2025",
+            "spreadsheet": None,
+            "worksheet_prefix": "",
+            "users": USERS,
+            "admin": ADMIN_USER,
+            "photo_folder": "dublin-trip-2025",
+            "shard_by_day": setting_list(get_setting("SHARD_BY_DAY", []))
+        }
+    }
+    configured = get_setting("trips", {})
+    if not hasattr(configured, "items"):
+        return trips
+    for trip_id, config in configured.items():
+        # A trip sharing the default spreadsheet gets its own prefixed worksheets
+        spreadsheet = config.get("spreadsheet") or None
+        trips[trip_id] = {
+            "id": trip_id,
+            "name": config.get("name", trip_id),
+            "spreadsheet": spreadsheet,
+            "worksheet_prefix": config.get("worksheet_prefix", "" if spreadsheet else f"{trip_id}_"),
+            "users": list(config.get("users", [])),
+            "admin": config.get("admin"),
+            "photo_folder": config.get("photo_folder", trip_id),
+            "shard_by_day": setting_list(config.get("shard_by_day", []))
+        }
+    return trips
+
+def requested_trip_id() -> Optional[str]:
+    """Trip id from the ?trip= URL parameter, if any."""
+    return st.query_params.get("trip")
+
+def get_trip_id() -> str:
+    """This session's trip: the ?trip= parameter, else the default trip."""
+    trip_id = requested_trip_id()
+    return trip_id if trip_id in get_trips() else DEFAULT_TRIP_ID
+
+def get_trip(trip_id: Optional[str] = None) -> dict:
+    """Config of a trip (this session's trip when no id is given)."""
+    return get_trips()[trip_id or get_trip_id()]
+
+def get_roster(trip_id: Optional[str] = None) -> list:
+    """Names that can log in to a trip."""
+    return get_trip(trip_id)["users"]
+
+def is_trip_admin(user_id: str) -> bool:
+    """Whether the user administers this session's trip."""
+    return user_id == get_trip()["admin"]
+
+def trip_sheet(worksheet: str, trip_id: Optional[str] = None) -> tuple:
+    """(spreadsheet, worksheet name) holding a trip's copy of a worksheet.
+
+    The spreadsheet is None for the connection's default spreadsheet.
+    """
+    trip = get_trip(trip_id)
+    return trip["spreadsheet"], f"{trip['worksheet_prefix']}{worksheet}"
+
+# =============================================================================
+# SHARED SHEET CACHE
+# =============================================================================
+
+# Every worksheet a trip uses, with the header row it is created with
+SHEET_HEADERS = {
+    "Rules": ["user_id", "rule", "timestamp", "votes", "idem_key"],
+    "Inquiries": ["issuer", "fined_person", "rule_violated", "evidence", "timestamp", "idem_key"],
+    "Bets": [
+        "user_id", "race_num", "horse", "stake", "odds_num", "odds_den", "bet_type", "places",
+        "place_fraction", "legs", "timestamp", "result", "payout", "runner_no", "idem_key"
+    ],
+    "Ratings": ["user_id", "pub", "drink_type", "timestamp", "idem_key"],
+    "Quotes": ["submitter", "speaker", "quote", "timestamp", "votes", "voters", "idem_key"],
+    "SideBets": ["creator", "description", "stake", "timestamp", "taker", "result", "settled_by", "idem_key"],
+    "MVPVotes": ["voter", "day", "nominee", "timestamp"],
+    "Photos": ["uploader", "caption", "image_url", "timestamp", "likes", "likers", "phash", "idem_key"],
+    "QuoteVotes": ["quote_id", "voter", "timestamp", "idem_key"],
+    "PhotoLikes": ["photo_id", "liker", "timestamp", "idem_key"],
+}
+TRIP_SHEETS = list(SHEET_HEADERS)
+SHEET_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "sheets.sqlite")
+SHEET_REFRESH_WORKERS = 2
+
+class SheetCache:
+    """Worksheet snapshots and version stamps in SQLite, shared by every app process.
+
+    Any number of Streamlit replicas pointed at the same file share one read
+    path: a snapshot fetched by one serves the others until it is older than
+    the caller's ttl. Every write bumps the sheet's version, which retires its
+    snapshot everywhere at once. Each process keeps the last snapshot it
+    decoded, so reading an unchanged sheet costs one small query.
+
+    Snapshots are stored as Parquet (pickle for frames Arrow can't hold) and
+    outlive the process, so after a restart the last one on disk can be served
+    at once while a background refresh fetches the live sheet.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._memo = {}
+        self._fresh = set()
+        self._refreshing = set()
+        self._refresher = ThreadPoolExecutor(max_workers=SHEET_REFRESH_WORKERS, thread_name_prefix="sheet-refresh")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._execute("PRAGMA journal_mode=WAL")
+        self._execute("CREATE TABLE IF NOT EXISTS versions (sheet TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS snapshots "
+            "(sheet TEXT PRIMARY KEY, version INTEGER NOT NULL, fetched REAL NOT NULL, data BLOB NOT NULL)"
+        )
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS leases (sheet TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        for table, column in [
+            ("snapshots", "format TEXT NOT NULL DEFAULT 'pickle'"),
+            ("snapshots", "full_fetched REAL NOT NULL DEFAULT 0"),
+            ("versions", "rewritten INTEGER NOT NULL DEFAULT 0"),
+        ]:
+            try:
+                self._execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+            except sqlite3.OperationalError:
+                pass  # already added
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                return db.execute(sql, params).fetchall()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _encode(df: pd.DataFrame) -> tuple:
+        try:
+            buffer = io.BytesIO()
+            df.to_parquet(buffer)
+            return "parquet", buffer.getvalue()
+        except Exception:
+            # Mixed-type columns have no Arrow type - keep them exactly as read
+            return "pickle", pickle.dumps(df)
+
+    @staticmethod
+    def _decode(fmt: str, data: bytes) -> pd.DataFrame:
+        if fmt == "parquet":
+            return pd.read_parquet(io.BytesIO(data))
+        return pickle.loads(data)
+
+    def _load(self, sheet: str, stamp: tuple) -> Optional[pd.DataFrame]:
+        """Decoded snapshot with the given (version, fetched) stamp, via the memo."""
+        with self._lock:
+            memo = self._memo.get(sheet)
+        if memo is None or memo[0] != stamp:
+            rows = self._execute(
+                "SELECT format, data FROM snapshots WHERE sheet = ? AND version = ? AND fetched = ?",
+                (sheet, *stamp)
+            )
+            if not rows:
+                return None
+            df = self._decode(*rows[0])
+            # Lets views derived from the rows (see derived) find this snapshot
+            df.attrs["snapshot"] = (sheet, stamp)
+            memo = (stamp, df, {})
+            with self._lock:
+                self._memo[sheet] = memo
+        return memo[1].copy()
+
+    def derived(self, sheet: str, stamp: tuple, name: str, rows: int, build):
+        """build(), computed once per decoded snapshot and shared by every caller.
+
+        Falls back to an uncached build() if the snapshot is no longer this
+        process's latest, or the caller's frame has lost or gained rows.
+        """
+        with self._lock:
+            memo = self._memo.get(sheet)
+        if memo is None or memo[0] != stamp or len(memo[1]) != rows:
+            return build()
+        views = memo[2]
+        if name not in views:
+            views[name] = build()
+        return views[name]
+
+    def version(self, sheet: str) -> int:
+        """Current version stamp of a sheet (0 if it was never written)."""
+        rows = self._execute("SELECT version FROM versions WHERE sheet = ?", (sheet,))
+        return rows[0][0] if rows else 0
+
+    def stamp(self, sheet: str) -> tuple:
+        """(version, fetched): the sheet's version and when its stored snapshot was fetched (0 if none).
+
+        Changes on every write and on every fetch, background refreshes included.
+        """
+        return tuple(self._execute(
+            "SELECT COALESCE(v.version, 0), COALESCE(s.fetched, 0) FROM (SELECT ? AS sheet) AS k "
+            "LEFT JOIN versions AS v ON v.sheet = k.sheet LEFT JOIN snapshots AS s ON s.sheet = k.sheet",
+            (sheet,)
+        )[0])
+
+    def get(self, sheet: str, ttl: float) -> tuple:
+        """(frame, version): the snapshot if current and younger than ttl (else None), and the sheet's version."""
+        version, snap_version, fetched = self._execute(
+            "SELECT COALESCE(v.version, 0), s.version, s.fetched FROM (SELECT ? AS sheet) AS k "
+            "LEFT JOIN versions AS v ON v.sheet = k.sheet LEFT JOIN snapshots AS s ON s.sheet = k.sheet",
+            (sheet,)
+        )[0]
+        if snap_version != version or ttl <= 0 or time.time() - fetched > ttl:
+            return None, version
+        return self._load(sheet, (snap_version, fetched)), version
+
+    def latest(self, sheet: str) -> Optional[pd.DataFrame]:
+        """The last stored snapshot of a sheet, however old or superseded."""
+        rows = self._execute("SELECT version, fetched FROM snapshots WHERE sheet = ?", (sheet,))
+        return self._load(sheet, rows[0]) if rows else None
+
+    def delta_base(self, sheet: str) -> tuple:
+        """(frame, full_fetched) of the latest snapshot if no write has rewritten
+        the sheet since it was taken, else (None, 0). New rows can be appended to it."""
+        rows = self._execute(
+            "SELECT s.version, s.fetched, s.full_fetched FROM snapshots AS s "
+            "LEFT JOIN versions AS v ON v.sheet = s.sheet "
+            "WHERE s.sheet = ? AND s.version >= COALESCE(v.rewritten, 0)",
+            (sheet,)
+        )
+        if not rows:
+            return None, 0
+        version, fetched, full_fetched = rows[0]
+        return self._load(sheet, (version, fetched)), full_fetched
+
+    def put(self, sheet: str, version: int, df: pd.DataFrame, full_fetched: Optional[float] = None):
+        """Store a snapshot fetched at `version`, unless a write has bumped it since.
+
+        full_fetched is when the rows were last read in full (now, unless the
+        frame was extended by a delta sync).
+        """
+        fmt, data = self._encode(df)
+        now = time.time()
+        self._execute(
+            "INSERT OR REPLACE INTO snapshots (sheet, version, fetched, data, format, full_fetched) "
+            "SELECT ?, ?, ?, ?, ?, ? WHERE COALESCE((SELECT version FROM versions WHERE sheet = ?), 0) = ?",
+            (sheet, version, now, data, fmt, full_fetched or now, sheet, version)
+        )
+        with self._lock:
+            self._fresh.add(sheet)
+
+    def bump(self, sheet: str, rewrite: bool = True):
+        """Mark a sheet as written, retiring its snapshot in every process.
+
+        Pass rewrite=False for pure appends, which leave earlier rows untouched
+        and so still allow a delta sync from the old snapshot.
+        """
+        self._execute(
+            "INSERT INTO versions (sheet, version, rewritten) VALUES (?, 1, ?) "
+            "ON CONFLICT(sheet) DO UPDATE SET version = version + 1, "
+            "rewritten = CASE WHEN ? THEN version + 1 ELSE rewritten END",
+            (sheet, 1 if rewrite else 0, rewrite)
+        )
+
+    def acquire_lease(self, sheet: str, owner: str, seconds: float, wait: float) -> bool:
+        """Take (or extend) the right to write a sheet, waiting up to `wait` seconds.
+
+        A lease left by a crashed writer lapses after `seconds`.
+        """
+        deadline = time.time() + wait
+        while True:
+            now = time.time()
+            taken = self._execute(
+                "INSERT INTO leases (sheet, owner, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT(sheet) DO UPDATE SET owner = excluded.owner, expires = excluded.expires "
+                "WHERE leases.expires < ? OR leases.owner = excluded.owner RETURNING owner",
+                (sheet, owner, now + seconds, now)
+            )
+            if taken:
+                return True
+            if now >= deadline:
+                return False
+            time.sleep(0.1)
+
+    def release_lease(self, sheet: str, owner: str):
+        self._execute("DELETE FROM leases WHERE sheet = ? AND owner = ?", (sheet, owner))
+
+    def is_cold(self, sheet: str) -> bool:
+        """True until this process has fetched the sheet itself."""
+        with self._lock:
+            return sheet not in self._fresh
+
+    def refresh_async(self, sheet: str, version: int, fetch):
+        """Fetch a sheet in the background and store it (once at a time per sheet).
+
+        fetch returns (frame, full_fetched) as taken by put.
+        """
+        with self._lock:
+            if sheet in self._refreshing:
+                return
+            self._refreshing.add(sheet)
+
+        def run():
+            try:
+                self.put(sheet, version, *fetch())
+            except Exception:
+                pass  # still cold - the next read serves the snapshot and tries again
+            finally:
+                with self._lock:
+                    self._refreshing.discard(sheet)
+
+        self._refresher.submit(run)
+
+@st.cache_resource
+def get_sheet_cache() -> SheetCache:
+    """The shared sheet cache; set SHEET_CACHE_PATH to a path every replica can reach."""
+    return SheetCache(get_setting("SHEET_CACHE_PATH", SHEET_CACHE_PATH))
+
+def sheet_cache_key(spreadsheet: Optional[str], sheet_name: str) -> str:
+    """Cache key of a worksheet, unique across trips and spreadsheets."""
+    return f"{spreadsheet or ''}#{sheet_name}"
+
+def read_sheet(worksheet: str, ttl: int = 60, trip_id: Optional[str] = None, allow_stale: bool = False) -> pd.DataFrame:
+    """Read a trip's worksheet through the shared cache, raising on API errors.
+
+    With allow_stale, the first read of a sheet in a freshly started process
+    returns the last snapshot on disk straight away (marked attrs["stale"])
+    and refreshes it in the background. Writes never need it: commits read
+    the sheet afresh.
+    """
+    spreadsheet, sheet_name = trip_sheet(worksheet, trip_id)
+    key = sheet_cache_key(spreadsheet, sheet_name)
+    cache = get_sheet_cache()
+    df, version = cache.get(key, ttl)
+    if df is not None:
+        return df
+
+    def fetch():
+        if base_worksheet(worksheet) in APPEND_ONLY_SHEETS:
+            base, full_fetched = cache.delta_base(key)
+            if base is not None and time.time() - full_fetched < SHEET_FULL_RELOAD_SECONDS:
+                merged = fetch_new_rows(spreadsheet, sheet_name, base)
+                if merged is not None:
+                    merged.attrs.pop("snapshot", None)
+                    return merged, full_fetched
+        conn = get_gsheets_connection()
+        try:
+            return conn.read(spreadsheet=spreadsheet, worksheet=sheet_name, usecols=None, ttl=0), None
+        except WorksheetNotFound:
+            if not created_on_write(worksheet):
+                raise
+            # Not written to yet - its first write creates it
+            return pd.DataFrame(columns=SHEET_HEADERS.get(base_worksheet(worksheet), [])), None
+
+    if allow_stale and ttl > 0 and cache.is_cold(key):
+        stale = cache.latest(key)
+        if stale is not None:
+            cache.refresh_async(key, version, fetch)
+            stale.attrs["stale"] = True
+            return stale
+
+    df, full_fetched = fetch()
+    cache.put(key, version, df, full_fetched)
+    return df
+
+def mark_sheet_written(worksheet: str, trip_id: Optional[str] = None, rewrite: bool = True):
+    """Invalidate a trip's worksheet in the shared cache after writing to it."""
+    get_sheet_cache().bump(sheet_cache_key(*trip_sheet(worksheet, trip_id)), rewrite=rewrite)
+    st.cache_data.clear()
+
+def refresh_trip_data():
+    """Force the trip's next reads to come from the API, in every process."""
+    for worksheet in trip_worksheets():
+        get_sheet_cache().bump(sheet_cache_key(*trip_sheet(worksheet)))
+    st.cache_data.clear()
+
+# =============================================================================
+# DELTA SYNC
+# =============================================================================
+
+# Sheets the app only ever appends to. Refreshing one fetches the rows after the
+# last known row (plus that row, to check it still matches) instead of the
+# whole sheet. MVPVotes and Bets are edited in place, so they always reload.
+APPEND_ONLY_SHEETS = {"Ratings", "Inquiries", "Photos", "Quotes", "QuoteVotes", "PhotoLikes"}
+SHEET_FULL_RELOAD_SECONDS = 600  # also catches hand edits further up the sheet
+
+def spreadsheet_id(spreadsheet: Optional[str]) -> Optional[str]:
+    """ID of a spreadsheet URL (None for the connection's default spreadsheet)."""
+    if spreadsheet is None:
+        try:
+            spreadsheet = st.secrets["connections"]["gsheets"]["spreadsheet"]
+        except Exception:
+            spreadsheet = GOOGLE_SHEET_URL
+    match = re.search(r"/d/([a-zA-Z0-9_-]+)", str(spreadsheet))
+    return match.group(1) if match else None
+
+@st.cache_resource
+def get_sheets_service():
+    """Sheets API client using the connection's service account, or None without one."""
+    try:
+        from google.oauth2.service_account import Credentials
+        from googleapiclient.discovery import build
+        info = {k: v for k, v in st.secrets["connections"]["gsheets"].items() if k != "spreadsheet"}
+        credentials = Credentials.from_service_account_info(
+            info, scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
+        )
+        return build("sheets", "v4", credentials=credentials, cache_discovery=False)
+    except Exception:
+        return None
+
+def _cell_key(value) -> str:
+    """Comparable form of a cell, whether it came from a frame or the values API."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    try:
+        return repr(float(value))
+    except (TypeError, ValueError):
+        return str(value).strip()
+
+def fetch_new_rows(spreadsheet: Optional[str], sheet_name: str, base: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """`base` extended with the rows added to the sheet since it was read.
+
+    Returns None when only a full reload will do: no API client, an empty base,
+    or the last row of `base` no longer matches the sheet.
+    """
+    service = get_sheets_service()
+    sheet_id = spreadsheet_id(spreadsheet)
+    if service is None or sheet_id is None or base.empty:
+        return None
+
+    columns = list(base.columns)
+    # Row 1 is the header, so base's last row is sheet row len(base) + 1
+    first_row = len(base) + 1
+    try:
+        result = service.spreadsheets().values().get(
+            spreadsheetId=sheet_id,
+            range=f"'{sheet_name}'!A{first_row}:ZZ",
+            valueRenderOption="UNFORMATTED_VALUE"
+        ).execute()
+    except Exception:
+        return None
+
+    rows = [row + [None] * (len(columns) - len(row)) for row in result.get("values", [])]
+    if not rows or [_cell_key(v) for v in rows[0][:len(columns)]] != [_cell_key(v) for v in base.iloc[-1]]:
+        return None
+    new_rows = [row[:len(columns)] for row in rows[1:] if any(_cell_key(v) for v in row)]
+    if not new_rows:
+        return base
+
+    tail = pd.DataFrame(new_rows, columns=columns).replace("", np.nan)
+    for col in columns:
+        try:
+            tail[col] = tail[col].astype(base[col].dtype)
+        except (TypeError, ValueError):
+            pass
+    return pd.concat([base, tail], ignore_index=True)
+
 # =============================================================================
 # GOOGLE SHEETS CONNECTION
 # =============================================================================
@@ -529,68 +1018,837 @@ def get_gsheets_connection():
     return st.connection("gsheets", type=GSheetsConnection)
 
 @retry_with_backoff()
-def load_sheet_data(worksheet: str, ttl: int = 60) -> pd.DataFrame:
-    """Load data from a specific worksheet with caching."""
+def load_sheet_data(worksheet: str, ttl: int = 60, trip_id: Optional[str] = None) -> pd.DataFrame:
+    """Load data from a specific worksheet of the trip with caching.
+
+    Saves still waiting in the write journal are applied on top (see overlay_pending).
+    A frame that isn't the sheet's current rows - the read failed, or it is a
+    snapshot served while a refresh runs - is marked attrs["stale"], so
+    indexes and memos don't keep it.
+    """
+    pending = get_write_journal().pending(trip_id or get_trip_id(), worksheet)
     try:
-        conn = get_gsheets_connection()
-        return conn.read(worksheet=worksheet, usecols=None, ttl=ttl)
+        df = drop_repeat_submissions(read_sheet(worksheet, ttl=ttl, trip_id=trip_id, allow_stale=True))
+        stale = df.attrs.get("stale", False)
     except Exception as e:
-        st.error(f"Error loading {worksheet}: {e}")
-        return pd.DataFrame()
+        stale = True
+        if not pending:
+            st.error(f"Error loading {worksheet}: {e}")
+            df = pd.DataFrame()
+            df.attrs["stale"] = True
+            return df
+        # Show the saves on top of the last rows we had, however old
+        df = get_sheet_cache().latest(sheet_cache_key(*trip_sheet(worksheet, trip_id)))
+        df = drop_repeat_submissions(df) if df is not None else pd.DataFrame()
+    if pending:
+        df = overlay_pending(df, pending)
+        df.attrs["stale"] = stale
+    return df
+
+def created_on_write(worksheet: str) -> bool:
+    """True for worksheets the app adds on their first write (see CREATE_ON_WRITE_SHEETS)."""
+    return worksheet in CREATE_ON_WRITE_SHEETS or base_worksheet(worksheet) != worksheet
+
+def sheet_revision(worksheet: str, trip_id: Optional[str] = None) -> tuple:
+    """(write version, snapshot fetch time, saves pending in the journal) of a trip's worksheet.
+
+    Changes whenever what load_sheet_data returns for it may have changed -
+    a write, a fetch (background refreshes included) or a journaled save -
+    without loading it.
+    """
+    trip_id = trip_id or get_trip_id()
+    key = sheet_cache_key(*trip_sheet(worksheet, trip_id))
+    return *get_sheet_cache().stamp(key), len(get_write_journal().pending(trip_id, worksheet))
+
+def append_to_sheet(worksheet: str, data: dict, idem_key: Optional[str] = None):
+    """Append a row to a specific worksheet.
+
+    With an idem_key (see submission_key), repeats of the same submission are dropped.
+    """
+    if idem_key:
+        data = {**data, "idem_key": idem_key}
+    return append_rows_to_sheet(worksheet, [data], idem_key=idem_key)
+
+def append_rows_to_sheet(worksheet: str, rows: list, trip_id: Optional[str] = None, idem_key: Optional[str] = None):
+    """Append several rows to a worksheet in a single write (one per day shard if sharded).
+
+    Pass trip_id when calling from outside a script run (e.g. a worker thread).
+    """
+    if worksheet not in get_trip(trip_id)["shard_by_day"]:
+        return commit_ops(worksheet, [op_append(rows)], trip_id, idem_key)
+    by_shard = {}
+    for row in rows:
+        day = trip_day(parse_timestamp(row.get("timestamp")) or datetime.now())
+        by_shard.setdefault(shard_name(worksheet, day), []).append(row)
+    return all(
+        commit_ops(name, [op_append(shard_rows)], trip_id, idem_key)
+        for name, shard_rows in by_shard.items()
+    )
+
+# =============================================================================
+# COMMIT QUEUE
+# =============================================================================
+
+# Writes are ops applied to a worksheet as it stands when they commit, not
+# whole frames read earlier, so two people saving at once both land. Each
+# process has one writer thread, and it holds the worksheet's lease in the
+# shared cache while committing, so replicas take turns as well.
+WRITE_LEASE_SECONDS = 30
+COMMIT_TIMEOUT_SECONDS = 60
+COMMIT_ATTEMPTS = 3
+# Rewrite the whole worksheet once more rows than this have changed
+IN_PLACE_ROW_LIMIT = 5
+# Worksheets added to the spreadsheet by their first write if missing (day
+# shards are too); until then they read as just their SHEET_HEADERS columns
+CREATE_ON_WRITE_SHEETS = {"QuoteVotes", "PhotoLikes"}
+
+def op_append(rows: list) -> dict:
+    """Add rows at the end."""
+    return {"op": "append", "rows": rows}
+
+def op_upsert(key: dict, values: dict, row: Optional[int] = None) -> dict:
+    """Set values on the rows matching key, or append them as a new row if none do.
+
+    row is the index label of the matching row if the caller knows it (e.g.
+    from an index over the sheet); it is checked first, saving a full scan.
+    """
+    op = {"op": "upsert", "match": key, "values": values}
+    if row is not None:
+        op["row"] = int(row)
+    return op
+
+def op_update_where(match: dict, values: dict) -> dict:
+    """Set values on every row matching all of match's column values."""
+    return {"op": "update_where", "match": match, "values": values}
+
+def op_delete_where(match: dict) -> dict:
+    """Remove every row matching all of match's column values."""
+    return {"op": "delete_where", "match": match}
+
+def op_clear() -> dict:
+    """Remove every row, keeping the header."""
+    return {"op": "clear"}
+
+def _match_rows(df: pd.DataFrame, match: dict, row: Optional[int] = None) -> pd.Series:
+    if row is not None and row in df.index and all(
+        col in df.columns and _cell_key(df.at[row, col]) == _cell_key(value) for col, value in match.items()
+    ):
+        return pd.Series(df.index == row, index=df.index)
+    mask = pd.Series(True, index=df.index)
+    for col, value in match.items():
+        if col not in df.columns:
+            return pd.Series(False, index=df.index)
+        mask &= df[col].map(_cell_key) == _cell_key(value)
+    return mask
+
+def apply_op(df: pd.DataFrame, op: dict) -> pd.DataFrame:
+    """The worksheet frame with one op applied."""
+    kind = op["op"]
+    if kind == "clear":
+        return df.iloc[:0] if not df.empty else df
+    if kind == "append":
+        new_rows = pd.DataFrame(op["rows"])
+        if "idem_key" in new_rows.columns and "idem_key" in df.columns:
+            # Already written, e.g. by a replica that didn't see the first submission
+            new_rows = new_rows[~(new_rows["idem_key"].notna() & new_rows["idem_key"].isin(df["idem_key"]))]
+            if new_rows.empty:
+                return df
+        if not len(df.columns):
+            return new_rows
+        # Number the new rows after the existing ones, whose labels stay their sheet rows
+        start = int(df.index.max()) + 1 if len(df) else 0
+        new_rows.index = pd.RangeIndex(start, start + len(new_rows))
+        return pd.concat([df, new_rows])
+    mask = _match_rows(df, op["match"], op.get("row"))
+    if kind == "delete_where":
+        return df[~mask].reset_index(drop=True)
+    if kind == "upsert" and not mask.any():
+        return apply_op(df, op_append([{**op["match"], **op["values"]}]))
+    updated = df.copy()
+    for col, value in op["values"].items():
+        if col not in updated.columns:
+            updated[col] = pd.Series(pd.NA, index=updated.index, dtype=object)
+        try:
+            updated.loc[mask, col] = value
+        except (TypeError, ValueError):
+            # e.g. text into a column read as numbers
+            updated[col] = updated[col].astype(object)
+            updated.loc[mask, col] = value
+    return updated
+
+def _sheet_values(row) -> list:
+    return ["" if pd.isna(v) else (v.item() if hasattr(v, "item") else v) for v in row]
 
 @retry_with_backoff()
-def append_to_sheet(worksheet: str, data: dict):
-    """Append a row to a specific worksheet."""
+def _write_sheet(spreadsheet: Optional[str], sheet_name: str, base: pd.DataFrame, updated: pd.DataFrame):
+    """Write `updated` over a worksheet that holds `base`.
+
+    New rows at the end are appended, and when only a few existing rows
+    changed in place just those are sent (one batch update), so a save costs
+    the same however long the sheet is. Row labels of a frame read from the
+    sheet are its data row numbers - blank rows are dropped on read but keep
+    their numbers - so label + 2 is the row to write. Anything else (deleted
+    rows, new columns) rewrites the whole worksheet. Values are entered as
+    typed (USER_ENTERED) either way.
+    """
+    conn = get_gsheets_connection()
+    kept, added = updated.iloc[:len(base)], updated.iloc[len(base):]
+    # A worksheet just created has no header row yet, so any columns will do
+    same_columns = list(updated.columns) == list(base.columns) or not len(base.columns)
+    if same_columns and kept.index.equals(base.index):
+        changed = kept.index[(base.map(_cell_key) != kept.map(_cell_key)).any(axis=1)] if len(base.columns) else kept.index
+        if len(changed) <= IN_PLACE_ROW_LIMIT:
+            try:
+                sheet = conn.client._select_worksheet(spreadsheet=spreadsheet, worksheet=sheet_name)
+            except AttributeError:
+                sheet = None  # public-URL connections have no worksheet handle - rewrite instead
+            if sheet is not None:
+                if len(changed):
+                    sheet.batch_update([
+                        {"range": f"A{label + 2}", "values": [_sheet_values(updated.loc[label])]}
+                        for label in changed
+                    ], value_input_option="USER_ENTERED")
+                if len(added):
+                    rows = [_sheet_values(row) for row in added.itertuples(index=False)]
+                    if not len(base.columns):
+                        rows.insert(0, list(updated.columns))  # header row first
+                    sheet.append_rows(rows, value_input_option="USER_ENTERED", table_range="A1")
+                return
+    conn.update(spreadsheet=spreadsheet, worksheet=sheet_name, data=updated)
+
+def _commit(worksheet: str, trip_id: str, ops: list, owner: str):
+    """Apply ops to a worksheet under its write lease."""
+    spreadsheet, sheet_name = trip_sheet(worksheet, trip_id)
+    key = sheet_cache_key(spreadsheet, sheet_name)
+    cache = get_sheet_cache()
+    if not cache.acquire_lease(key, owner, WRITE_LEASE_SECONDS, wait=COMMIT_TIMEOUT_SECONDS):
+        raise TimeoutError(f"{worksheet} is busy - try again in a moment")
     try:
-        conn = get_gsheets_connection()
-        # Use cached data to avoid rate limits, clear cache after update
-        existing_df = conn.read(worksheet=worksheet, usecols=None, ttl=60)
-        new_row = pd.DataFrame([data])
-        updated_df = pd.concat([existing_df, new_row], ignore_index=True)
-        conn.update(worksheet=worksheet, data=updated_df)
-        # Clear cache for this worksheet
-        st.cache_data.clear()
+        appended = [row for op in ops if op["op"] == "append" for row in op["rows"]]
+        if created_on_write(worksheet) and sheet_name not in list_worksheets(spreadsheet):
+            if not appended:
+                return  # nothing to edit or clear before its first row
+            get_gsheets_connection().client._open_spreadsheet(spreadsheet=spreadsheet).add_worksheet(
+                title=sheet_name, rows=len(appended) + 1, cols=max(len(row) for row in appended)
+            )
+            list_worksheets.clear()
+        for _ in range(COMMIT_ATTEMPTS):
+            version = cache.version(key)
+            base = read_sheet(worksheet, ttl=60, trip_id=trip_id)
+            updated = base
+            for op in ops:
+                updated = apply_op(updated, op)
+            if updated is base:
+                return  # nothing left to write
+            # Written by someone else since we read (e.g. a replica whose lease lapsed) - redo
+            if cache.version(key) != version:
+                continue
+            _write_sheet(spreadsheet, sheet_name, base, updated)
+            mark_sheet_written(worksheet, trip_id, rewrite=any(op["op"] != "append" for op in ops))
+            return
+        raise RuntimeError(f"{worksheet} kept changing while saving - try again")
+    finally:
+        cache.release_lease(key, owner)
+
+class CommitQueue:
+    """Single writer for every worksheet in this process.
+
+    Ops queued for a worksheet while an earlier commit is running are
+    applied together in its next commit, so a burst of saves costs one
+    read and one write rather than one of each per save.
+    """
+
+    def __init__(self):
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sheet-writer")
+
+    def submit(self, worksheet: str, ops: list, trip_id: str) -> Future:
+        """Queue ops on a trip's worksheet; the future resolves once they are written."""
+        future = Future()
+        key = (trip_id, worksheet)
+        with self._lock:
+            batch = self._pending.setdefault(key, [])
+            batch.append((ops, future))
+            scheduled = len(batch) > 1
+        if not scheduled:
+            self._writer.submit(self._drain, key)
+        return future
+
+    def _drain(self, key: tuple):
+        with self._lock:
+            batch = self._pending.pop(key, [])
+        trip_id, worksheet = key
+        try:
+            _commit(worksheet, trip_id, [op for ops, _ in batch for op in ops], self.owner)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+        else:
+            for _, future in batch:
+                future.set_result(True)
+
+@st.cache_resource
+def get_commit_queue() -> CommitQueue:
+    return CommitQueue()
+
+def commit_ops(worksheet: str, ops: list, trip_id: Optional[str] = None, idem_key: Optional[str] = None) -> bool:
+    """Save ops to a worksheet: journal them, and leave the write to the replayer.
+
+    Returns as soon as the ops are in the write journal, so saving never
+    waits on the Sheets API. Ops sent with an idem_key already accepted in
+    the last few minutes are dropped (and reported as saved). Pass trip_id
+    when calling from outside a script run (e.g. a worker thread).
+    """
+    trip_id = trip_id or get_trip_id()
+    recent = get_recent_submissions(trip_id)
+    if idem_key and not recent.add(idem_key):
         return True
+    try:
+        get_write_journal().append(trip_id, worksheet, keyed_ops(ops, idem_key or uuid.uuid4().hex))
     except Exception as e:
+        if idem_key:
+            recent.discard(idem_key)  # let the retry through
         st.error(f"Error saving to {worksheet}: {e}")
         return False
+    get_journal_replayer().wake()
+    return True
 
-@retry_with_backoff()
-def update_sheet(worksheet: str, df: pd.DataFrame):
-    """Update entire worksheet with dataframe."""
-    try:
-        conn = get_gsheets_connection()
-        conn.update(worksheet=worksheet, data=df)
-        st.cache_data.clear()
-        return True
-    except Exception as e:
-        st.error(f"Error updating {worksheet}: {e}")
-        return False
+# =============================================================================
+# DUPLICATE SUBMISSIONS
+# =============================================================================
+
+# How long (and how many) submission keys are remembered to drop repeats
+SUBMISSION_WINDOW_SECONDS = 600
+SUBMISSION_WINDOW_MAX = 10000
+
+class RecentKeys:
+    """Bounded set of keys that forgets each one `ttl` seconds after it was added."""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._added = OrderedDict()
+
+    def add(self, key: str) -> bool:
+        """Remember a key; False if it was already there."""
+        now = time.time()
+        with self._lock:
+            while self._added and next(iter(self._added.values())) < now - self.ttl:
+                self._added.popitem(last=False)
+            if key in self._added:
+                return False
+            self._added[key] = now
+            if len(self._added) > self.max_size:
+                self._added.popitem(last=False)
+            return True
+
+    def discard(self, key: str):
+        with self._lock:
+            self._added.pop(key, None)
+
+@st.cache_resource
+def get_recent_submissions(trip_id: str) -> RecentKeys:
+    """Submission keys a trip's writes have used recently."""
+    return RecentKeys(SUBMISSION_WINDOW_SECONDS, SUBMISSION_WINDOW_MAX)
+
+def submission_key(action: str, submitted: bool) -> Optional[str]:
+    """Idempotency key for a submit control's click, or None if it wasn't clicked.
+
+    The token is renewed on every run where the control isn't clicked, so every
+    click made on one rendered page - a double tap on a laggy connection -
+    carries the same key and only the first is saved.
+    """
+    tokens = st.session_state.setdefault("submission_tokens", {})
+    if not submitted:
+        tokens[action] = uuid.uuid4().hex
+        return None
+    return tokens.setdefault(action, uuid.uuid4().hex)
+
+def drop_repeat_submissions(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows without any repeat of an earlier row's idem_key (duplicates that reached the sheet)."""
+    if "idem_key" not in df.columns:
+        return df
+    keys = df["idem_key"]
+    repeats = keys.duplicated() & keys.notna() & (keys != "")
+    return df[~repeats] if repeats.any() else df
+
+def keyed_ops(ops: list, key: str) -> list:
+    """ops with an idem_key on every appended row, so replaying them can't add a row twice."""
+    return [
+        op_append([row if row.get("idem_key") else {**row, "idem_key": f"{key}:{i}"} for i, row in enumerate(op["rows"])])
+        if op["op"] == "append" else op
+        for op in ops
+    ]
 
 # =============================================================================
-# ADMIN: CLEAR ALL SHEETS
+# WRITE JOURNAL
 # =============================================================================
 
-def clear_all_sheets():
-    """ADMIN ONLY - Clear all data from all sheets while preserving headers."""
-    sheets = ["Rules", "Inquiries", "Bets", "Ratings", "Quotes", "SideBets", "MVPVotes", "Photos"]
+# Every save lands in this journal on disk first and a background replayer
+# pushes it to the sheet, oldest first, backing off while the API fails. The
+# app reads journaled rows as if saved, marked pending, until they land.
+WRITE_JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "journal.sqlite")
+REPLAY_BACKOFF_SECONDS = 2
+REPLAY_BACKOFF_MAX_SECONDS = 300
+REPLAY_POLL_SECONDS = 5
+# Entries still failing after this many tries are set aside so later saves can go
+REPLAY_MAX_ATTEMPTS = 10
+# How long a replayer may hold entries before another (e.g. a replica's) may retry them
+REPLAY_CLAIM_SECONDS = 2 * COMMIT_TIMEOUT_SECONDS
+# Set on rows that are only in the journal so far
+PENDING_COLUMN = "pending_sync"
+
+def _json_value(value):
+    if value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Can't save a {type(value).__name__} value")
+
+class WriteJournal:
+    """Append-only log of ops waiting to be written, in SQLite.
 
-    for sheet_name in sheets:
+    Entries for a worksheet are replayed in the order they were saved; an
+    entry leaves the journal only once its ops are in the sheet. One that
+    fails REPLAY_MAX_ATTEMPTS times is marked dead and skipped until retried.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._execute("PRAGMA journal_mode=WAL")
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS journal (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "trip_id TEXT NOT NULL, worksheet TEXT NOT NULL, ops TEXT NOT NULL, created REAL NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, next_attempt REAL NOT NULL DEFAULT 0, "
+            "claimed_until REAL NOT NULL DEFAULT 0, error TEXT)"
+        )
+        self._execute("CREATE INDEX IF NOT EXISTS journal_sheet ON journal (trip_id, worksheet, id)")
         try:
-            # Load current sheet to get headers
-            df = load_sheet_data(sheet_name, ttl=0)
+            self._execute("ALTER TABLE journal ADD COLUMN dead INTEGER NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass  # already added
 
-            if not df.empty:
-                # Create empty dataframe with same columns
-                empty_df = pd.DataFrame(columns=df.columns)
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                return db.execute(sql, params).fetchall()
+        finally:
+            db.close()
+
+    def append(self, trip_id: str, worksheet: str, ops: list):
+        self._execute(
+            "INSERT INTO journal (trip_id, worksheet, ops, created) VALUES (?, ?, ?, ?)",
+            (trip_id, worksheet, json.dumps(ops, default=_json_value), time.time())
+        )
 
-                # Update sheet with empty data (preserves headers)
-                conn = get_gsheets_connection()
-                conn.update(worksheet=sheet_name, data=empty_df)
-                st.success(f"Cleared {sheet_name}")
+    def pending(self, trip_id: str, worksheet: str) -> list:
+        """Ops lists of a worksheet's entries, oldest first."""
+        rows = self._execute(
+            "SELECT ops FROM journal WHERE trip_id = ? AND worksheet = ? AND NOT dead ORDER BY id", (trip_id, worksheet)
+        )
+        return [json.loads(ops) for ops, in rows]
+
+    def pending_worksheets(self, trip_id: str) -> list:
+        return [name for name, in self._execute(
+            "SELECT DISTINCT worksheet FROM journal WHERE trip_id = ? AND NOT dead", (trip_id,)
+        )]
+
+    def status(self, trip_id: str) -> tuple:
+        """(entries waiting, dead entries, error of the oldest failing entry or None) for a trip."""
+        return self._execute(
+            "SELECT COALESCE(SUM(NOT dead), 0), COALESCE(SUM(dead), 0), "
+            "(SELECT error FROM journal WHERE trip_id = ? AND attempts > 0 ORDER BY dead DESC, id LIMIT 1) "
+            "FROM journal WHERE trip_id = ?",
+            (trip_id, trip_id)
+        )[0]
+
+    def claim_due(self) -> list:
+        """Claim every entry of each worksheet whose oldest entry is due for a try.
+
+        Returns [(id, trip_id, worksheet, ops, attempts)] in id order.
+        """
+        now = time.time()
+        rows = self._execute(
+            "UPDATE journal SET claimed_until = ? WHERE claimed_until < ? AND NOT dead AND (trip_id, worksheet) IN ("
+            "SELECT trip_id, worksheet FROM journal AS j WHERE j.next_attempt <= ? AND j.claimed_until < ? "
+            "AND j.id = (SELECT MIN(id) FROM journal WHERE trip_id = j.trip_id AND worksheet = j.worksheet AND NOT dead)"
+            ") RETURNING id, trip_id, worksheet, ops, attempts",
+            (now + REPLAY_CLAIM_SECONDS, now, now, now)
+        )
+        return sorted((id_, trip_id, worksheet, json.loads(ops), attempts) for id_, trip_id, worksheet, ops, attempts in rows)
+
+    def done(self, ids: list):
+        self._execute(f"DELETE FROM journal WHERE id IN ({', '.join('?' * len(ids))})", tuple(ids))
+
+    def failed(self, ids: list, error: str, retry_in: float):
+        self._execute(
+            f"UPDATE journal SET attempts = attempts + 1, next_attempt = ?, claimed_until = 0, error = ?, "
+            f"dead = attempts + 1 >= ? WHERE id IN ({', '.join('?' * len(ids))})",
+            (time.time() + retry_in, error, REPLAY_MAX_ATTEMPTS, *ids)
+        )
+
+    def retry_dead(self, trip_id: str):
+        """Put a trip's dead entries back in line for another round of tries."""
+        self._execute(
+            "UPDATE journal SET dead = 0, attempts = 0, next_attempt = 0 WHERE trip_id = ? AND dead", (trip_id,)
+        )
+
+    def discard(self, trip_id: str):
+        """Drop a trip's unsynced entries (when its sheets are cleared)."""
+        self._execute("DELETE FROM journal WHERE trip_id = ?", (trip_id,))
+
+class JournalReplayer:
+    """Background thread writing journaled ops to the sheets through the commit queue."""
+
+    def __init__(self, journal: WriteJournal):
+        self.journal = journal
+        self._wake = threading.Event()
+        threading.Thread(target=self._run, name="journal-replay", daemon=True).start()
+
+    def wake(self):
+        """Replay now rather than at the next poll."""
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            try:
+                replayed = self.replay_due()
+            except Exception:
+                replayed = False  # journal unreadable for now - poll again
+            if not replayed:
+                self._wake.wait(REPLAY_POLL_SECONDS)
+                self._wake.clear()
+
+    def replay_due(self) -> bool:
+        """Push every due worksheet's entries, one commit per worksheet; True if any were due."""
+        batches = {}
+        for id_, trip_id, worksheet, ops, attempts in self.journal.claim_due():
+            batch = batches.setdefault((trip_id, worksheet), {"ids": [], "ops": [], "attempts": 0})
+            batch["ids"].append(id_)
+            batch["ops"].extend(ops)
+            batch["attempts"] = max(batch["attempts"], attempts)
+        futures = {key: get_commit_queue().submit(key[1], batch["ops"], key[0]) for key, batch in batches.items()}
+        for key, future in futures.items():
+            batch = batches[key]
+            try:
+                future.result(timeout=COMMIT_TIMEOUT_SECONDS)
+            except Exception as e:
+                retry_in = min(REPLAY_BACKOFF_MAX_SECONDS, REPLAY_BACKOFF_SECONDS * 2 ** batch["attempts"])
+                self.journal.failed(batch["ids"], str(e) or type(e).__name__, retry_in)
             else:
-                st.info(f"{sheet_name} already empty")
+                self.journal.done(batch["ids"])
+        return bool(batches)
+
+@st.cache_resource
+def get_write_journal() -> WriteJournal:
+    """The write journal; set WRITE_JOURNAL_PATH to keep it somewhere durable."""
+    return WriteJournal(get_setting("WRITE_JOURNAL_PATH", WRITE_JOURNAL_PATH))
+
+@st.cache_resource
+def get_journal_replayer() -> JournalReplayer:
+    """The process's replayer (started on first use)."""
+    return JournalReplayer(get_write_journal())
+
+def overlay_pending(df: pd.DataFrame, pending: list) -> pd.DataFrame:
+    """A loaded worksheet with journaled ops applied; appended rows get PENDING_COLUMN set.
+
+    Rows that have already reached the sheet are not added again (their
+    idem_key is there).
+    """
+    for ops in pending:
+        for op in ops:
+            if op["op"] == "append":
+                op = op_append([{**row, PENDING_COLUMN: True} for row in op["rows"]])
+            df = apply_op(df, op)
+    return df
+
+def committed_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """A loaded worksheet without the journal's pending rows, for indexes
+    that fold in new rows by position."""
+    if PENDING_COLUMN not in df.columns:
+        return df
+    return df[~df[PENDING_COLUMN].eq(True)]
+
+def pending_badge(row) -> str:
+    """Small "syncing" tag for a card whose row is still in the write journal."""
+    pending = row.get(PENDING_COLUMN)
+    if pd.isna(pending) or not pending:
+        return ""
+    return '<span style="color: #888888; font-size: 0.75rem;"> ⏳ syncing</span>'
+
+def render_sync_status():
+    """Banner while this trip has saves that haven't reached the sheets yet."""
+    replayer = get_journal_replayer()  # picks up entries left by a restart
+    journal = get_write_journal()
+    count, dead, error = journal.status(get_trip_id())
+    if dead:
+        st.error(
+            f"⚠️ {dead} save{'s' if dead != 1 else ''} couldn't be synced after "
+            f"{REPLAY_MAX_ATTEMPTS} tries and {'are' if dead != 1 else 'is'} on hold ({error})"
+        )
+        if st.button("RETRY HELD SAVES", key="retry_dead_saves", use_container_width=True):
+            journal.retry_dead(get_trip_id())
+            replayer.wake()
+            st.rerun()
+    if not count:
+        return
+    message = f"⏳ {count} save{'s' if count != 1 else ''} waiting to sync to the sheet"
+    if error and not dead:
+        st.warning(f"{message} - retrying ({error})")
+    else:
+        st.info(message)
+
+# =============================================================================
+# TIMELINES
+# =============================================================================
+
+class Timeline:
+    """A sheet's rows sorted by their parsed timestamp, for time-window queries.
+
+    Timestamps are parsed once into a datetime64 array, so feeds and per-day
+    views binary-search it instead of re-sorting and re-parsing strings. Rows
+    whose timestamp is missing or unreadable are kept aside in `undated`.
+    """
+
+    def __init__(self, df: pd.DataFrame, column: str = "timestamp"):
+        if df.empty or column not in df.columns:
+            self.frame, self.undated = df.iloc[:0], df
+            self.times = np.array([], dtype="datetime64[ns]")
+            return
+        parsed = pd.to_datetime(df[column], errors="coerce", format="ISO8601")
+        dated = parsed.notna().to_numpy()
+        times = parsed.to_numpy(dtype="datetime64[ns]")[dated]
+        order = np.argsort(times, kind="stable")
+        self.frame = df[dated].iloc[order]
+        self.undated = df[~dated]
+        self.times = times[order]
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def rows_between(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """Rows timestamped in [start, end), oldest first."""
+        i, j = np.searchsorted(self.times, np.array([start, end], dtype="datetime64[ns]"), side="left")
+        return self.frame.iloc[i:j]
+
+    def days(self) -> list:
+        """Trip days (see trip_day) with at least one row, oldest first."""
+        shifted = self.times - np.timedelta64(DAY_ROLLOVER_HOUR, "h")
+        return np.unique(shifted.astype("datetime64[D]")).astype(str).tolist()
+
+    def last_n(self, n: int) -> pd.DataFrame:
+        """The n most recent rows, newest first."""
+        return self.frame.iloc[::-1].iloc[:n]
+
+    def newest_first(self) -> pd.DataFrame:
+        """Every row, newest first, then any undated ones."""
+        return pd.concat([self.last_n(len(self)), self.undated]) if not self.undated.empty else self.last_n(len(self))
+
+    @staticmethod
+    def merge(timelines: list) -> "Timeline":
+        """One timeline over several (e.g. a worksheet's day shards)."""
+        if len(timelines) == 1:
+            return timelines[0]
+        merged = Timeline.__new__(Timeline)
+        frames = [t.frame for t in timelines if len(t)]
+        undated = [t.undated for t in timelines if not t.undated.empty]
+        times = np.concatenate([t.times for t in timelines]) if timelines else np.array([], dtype="datetime64[ns]")
+        order = np.argsort(times, kind="stable")
+        merged.frame = pd.concat(frames, ignore_index=True).iloc[order] if frames else pd.DataFrame()
+        merged.undated = pd.concat(undated, ignore_index=True) if undated else pd.DataFrame()
+        merged.times = times[order]
+        return merged
+
+def timeline_of(df: pd.DataFrame) -> Timeline:
+    """Timeline of a loaded sheet, built once per cached snapshot."""
+    snapshot = df.attrs.get("snapshot")
+    if snapshot is None:
+        return Timeline(df)
+    return get_sheet_cache().derived(*snapshot, "timeline", len(df), lambda: Timeline(df))
+
+# =============================================================================
+# DAY SHARDS
+# =============================================================================
+
+# A trip can list high-volume worksheets under shard_by_day (SHARD_BY_DAY for
+# the default trip). New rows then go to one worksheet per trip day, named
+# <worksheet>_<YYYYMMDD>; the unsharded worksheet keeps anything written before.
+SHARD_SUFFIX = re.compile(r"_(\d{4})(\d{2})(\d{2})$")
+
+def shard_name(worksheet: str, day: str) -> str:
+    """Worksheet holding one trip day (YYYY-MM-DD) of a sharded worksheet."""
+    return f"{worksheet}_{day.replace('-', '')}"
+
+def base_worksheet(worksheet: str) -> str:
+    """Logical worksheet a shard belongs to (the name itself if not a shard)."""
+    return SHARD_SUFFIX.sub("", worksheet)
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """datetime of an ISO timestamp cell, or None if missing or unreadable."""
+    try:
+        return datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+
+@st.cache_data(ttl=60, show_spinner=False)
+def list_worksheets(spreadsheet: Optional[str]) -> list:
+    """Titles of every worksheet in a spreadsheet (None for the default one)."""
+    service = get_sheets_service()
+    sheet_id = spreadsheet_id(spreadsheet)
+    if service is not None and sheet_id is not None:
+        meta = service.spreadsheets().get(spreadsheetId=sheet_id, fields="sheets.properties.title").execute()
+        return [sheet["properties"]["title"] for sheet in meta.get("sheets", [])]
+    conn = get_gsheets_connection()
+    return [ws.title for ws in conn.client._open_spreadsheet(spreadsheet=spreadsheet).worksheets()]
+
+@st.cache_resource(show_spinner=False)
+def ensure_trip_worksheets(trip_id: str) -> list:
+    """Add any of a trip's worksheets its spreadsheet lacks, with their header rows.
+
+    Runs once per process per trip, so a new trip works from its first visit.
+    Returns the names created; raises if the spreadsheet can't be listed or edited.
+    """
+    spreadsheet = get_trip(trip_id)["spreadsheet"]
+    existing = set(list_worksheets(spreadsheet))
+    missing = [worksheet for worksheet in TRIP_SHEETS if trip_sheet(worksheet, trip_id)[1] not in existing]
+    if missing:
+        book = get_gsheets_connection().client._open_spreadsheet(spreadsheet=spreadsheet)
+        for worksheet in missing:
+            headers = SHEET_HEADERS[worksheet]
+            sheet = book.add_worksheet(title=trip_sheet(worksheet, trip_id)[1], rows=100, cols=len(headers))
+            sheet.update("A1", [headers])
+        list_worksheets.clear()
+    return missing
+
+class ShardedSheet:
+    """Unified reader over a worksheet and its day shards, loading shards lazily.
+
+    Works for unsharded worksheets too (they are just the base worksheet), so
+    callers don't need to know how a trip stores its rows.
+    """
+
+    def __init__(self, worksheet: str, trip_id: Optional[str] = None):
+        self.worksheet = worksheet
+        self.trip_id = trip_id or get_trip_id()
+        self.days = []
+        if worksheet in get_trip(self.trip_id)["shard_by_day"]:
+            spreadsheet, sheet_name = trip_sheet(worksheet, self.trip_id)
+            try:
+                titles = list_worksheets(spreadsheet)
+            except Exception as e:
+                st.error(f"Error listing {worksheet} shards: {e}")
+                titles = []
+            # Shards whose first rows are still in the write journal
+            titles += [trip_sheet(name, self.trip_id)[1] for name in get_write_journal().pending_worksheets(self.trip_id)]
+            prefix = f"{sheet_name}_"
+            self.days = sorted({
+                "-".join(match.groups()) for title in titles
+                if title.startswith(prefix) and (match := SHARD_SUFFIX.search(title))
+                and len(title) == len(prefix) + 8
+            })
 
+    def names(self, days: Optional[list] = None) -> list:
+        """The base worksheet, then each day shard oldest first."""
+        return [self.worksheet] + [shard_name(self.worksheet, day) for day in (self.days if days is None else days)]
+
+    def shards(self, days: Optional[list] = None):
+        """Yield (name, frame) for the base worksheet, then each day shard oldest first."""
+        for name in self.names(days):
+            yield name, load_sheet_data(name, trip_id=self.trip_id)
+
+    def frame(self) -> pd.DataFrame:
+        """Every row, base worksheet first, then the shards in day order."""
+        frames = [df for _, df in self.shards() if not df.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def window(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """Rows timestamped in [start, end), oldest first, reading only the shards of those trip days."""
+        first, last = trip_day(start), trip_day(end - timedelta(microseconds=1))
+        days = [day for day in self.days if first <= day <= last]
+        return Timeline.merge([timeline_of(df) for _, df in self.shards(days)]).rows_between(start, end)
+
+    def trip_days(self) -> list:
+        """Trip days with rows, newest first: one per day shard, plus any in the base worksheet."""
+        base = timeline_of(load_sheet_data(self.worksheet, trip_id=self.trip_id))
+        return sorted(set(self.days) | set(base.days()), reverse=True)
+
+    def recent(self, n: int) -> Timeline:
+        """Timeline of at least the last n rows (if there are that many), reading the newest shards first."""
+        timelines, count = [], 0
+        for day in reversed(self.days):
+            timeline = timeline_of(load_sheet_data(shard_name(self.worksheet, day), trip_id=self.trip_id))
+            timelines.append(timeline)
+            count += len(timeline)
+            if count >= n:
+                break
+        else:
+            timelines.append(timeline_of(load_sheet_data(self.worksheet, trip_id=self.trip_id)))
+        return Timeline.merge(timelines[::-1])
+
+def trip_worksheets() -> list:
+    """Every worksheet of this session's trip, day shards included."""
+    worksheets = []
+    for worksheet in TRIP_SHEETS:
+        worksheets.append(worksheet)
+        worksheets.extend(shard_name(worksheet, day) for day in ShardedSheet(worksheet).days)
+    return worksheets
+
+def load_trip_sheet(worksheet: str) -> pd.DataFrame:
+    """All rows of a trip's worksheet, across its day shards if it has any."""
+    return ShardedSheet(worksheet).frame()
+
+class ShardAggregates:
+    """Per-shard results (e.g. scoring contributions), memoized by shard revision.
+
+    Past days' shards never change, so their aggregates are computed once per
+    process without even loading them; only today's shard is reloaded and
+    recomputed as rows arrive.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results = {}
+
+    def get(self, name: str, trip_id: str, compute):
+        """compute(shard frame), reusing the last result while the shard's revision is unchanged."""
+        revision = sheet_revision(name, trip_id)
+        key = (name, compute.__name__)
+        with self._lock:
+            cached = self._results.get(key)
+        if cached is not None and cached[0] == revision:
+            return cached[1]
+        df = load_sheet_data(name, trip_id=trip_id)
+        result = compute(df)
+        # Keep only results of the shard's current rows: not of a failed or
+        # stale read, nor of one the shard changed under
+        if not df.attrs.get("stale") and sheet_revision(name, trip_id) == revision:
+            with self._lock:
+                self._results[key] = (revision, result)
+        return result
+
+@st.cache_resource
+def get_shard_aggregates(trip_id: str) -> ShardAggregates:
+    """A trip's memoized per-shard aggregates."""
+    return ShardAggregates()
+
+# =============================================================================
+# ADMIN: CLEAR ALL SHEETS
+# =============================================================================
+
+def clear_all_sheets():
+    """ADMIN ONLY - Clear all data from the trip's sheets while preserving headers."""
+    get_write_journal().discard(get_trip_id())
+    queue = get_commit_queue()
+    for sheet_name in trip_worksheets():
+        try:
+            # Straight through the commit queue (not the journal) to report each result
+            queue.submit(sheet_name, [op_clear()], get_trip_id()).result(timeout=COMMIT_TIMEOUT_SECONDS)
+            st.success(f"Cleared {sheet_name}")
         except Exception as e:
             st.error(f"Error clearing {sheet_name}: {e}")
 
@@ -614,28 +1872,415 @@ def configure_cloudinary():
     except Exception as e:
         return False
 
-def upload_image_to_cloudinary(file) -> Optional[str]:
-    """Upload image to Cloudinary and return the URL."""
+def _upload_to_cloudinary(file, folder: str = "dublin-trip-2025") -> str:
+    """Upload image to Cloudinary and return the URL, raising on failure."""
+    configure_cloudinary()
+    result = cloudinary.uploader.upload(
+        file,
+        folder=folder,
+        transformation=[
+            {"width": 1200, "height": 1200, "crop": "limit"},
+            {"quality": "auto:good"}
+        ]
+    )
+    return result.get("secure_url")
+
+# =============================================================================
+# BLOB STORAGE
+# =============================================================================
+
+GALLERY_IMAGE_WIDTH = 800
+LOCAL_BLOB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "blobs")
+# Streamlit serves ./static at app/static when server.enableStaticServing is on
+LOCAL_BLOB_URL_PREFIX = "app/static/blobs"
+
+def get_setting(name: str, default=None):
+    """Read a setting from Streamlit secrets, falling back to the environment."""
     try:
-        configure_cloudinary()
-        result = cloudinary.uploader.upload(
-            file,
-            folder="dublin-trip-2025",
-            transformation=[
-                {"width": 1200, "height": 1200, "crop": "limit"},
-                {"quality": "auto:good"}
-            ]
-        )
-        return result.get("secure_url")
-    except Exception as e:
-        st.error(f"Upload failed: {e}")
+        if name in st.secrets:
+            return st.secrets[name]
+    except Exception:
+        pass
+    return os.environ.get(name, default)
+
+class BlobStore(ABC):
+    """Where photo bytes live. Backends store an image and hand back its URL."""
+
+    @abstractmethod
+    def put(self, data: bytes, filename: str) -> str:
+        """Store an image and return the URL to show it from."""
+
+    def variant_url(self, url: str, width: int) -> str:
+        """URL of a resized copy (no wider than width) of a stored image."""
+        return url
+
+class CloudinaryBlobStore(BlobStore):
+    """Images hosted on Cloudinary; variants are on-the-fly URL transformations."""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+
+    def put(self, data: bytes, filename: str) -> str:
+        return _upload_to_cloudinary(io.BytesIO(data), folder=self.folder)
+
+    def variant_url(self, url: str, width: int) -> str:
+        if "res.cloudinary.com" not in url or "/upload/" not in url:
+            return url
+        return url.replace("/upload/", f"/upload/w_{width},c_limit/", 1)
+
+class LocalBlobStore(BlobStore):
+    """Content-addressed images on local disk, for offline development and benchmarks.
+
+    Blobs are stored as <root>/<first two hex chars>/<sha256><ext>, so identical
+    uploads share a file. Resized variants are generated on first request and
+    kept next to the original.
+    """
+
+    def __init__(self, root: str = LOCAL_BLOB_DIR, url_prefix: str = LOCAL_BLOB_URL_PREFIX):
+        self.root = root
+        self.url_prefix = url_prefix.rstrip("/")
+        os.makedirs(self.root, exist_ok=True)
+
+    def _write(self, relpath: str, data: bytes):
+        """Write atomically so readers never see a half-written blob."""
+        path = os.path.join(self.root, relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def put(self, data: bytes, filename: str) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        ext = os.path.splitext(filename)[1].lower() or ".jpg"
+        relpath = f"{digest[:2]}/{digest}{ext}"
+        if not os.path.exists(os.path.join(self.root, relpath)):
+            self._write(relpath, data)
+        return f"{self.url_prefix}/{relpath}"
+
+    def variant_url(self, url: str, width: int) -> str:
+        if not url.startswith(self.url_prefix + "/"):
+            return url
+        relpath = url[len(self.url_prefix) + 1:]
+        variant_relpath = f"{os.path.splitext(relpath)[0]}_w{width}.jpg"
+        if not os.path.exists(os.path.join(self.root, variant_relpath)):
+            try:
+                img = Image.open(os.path.join(self.root, relpath))
+                img.draft("RGB", (width, width))
+                img = img.convert("RGB")
+                img.thumbnail((width, width))
+                buffer = io.BytesIO()
+                img.save(buffer, format="JPEG", quality=85)
+                self._write(variant_relpath, buffer.getvalue())
+            except Exception:
+                return url
+        return f"{self.url_prefix}/{variant_relpath}"
+
+@st.cache_resource
+def get_blob_store(trip_id: str) -> Optional[BlobStore]:
+    """Configured photo store for a trip: BLOB_STORE = "local" or "cloudinary" (the default when set up).
+
+    Each trip's photos go in their own folder.
+    """
+    folder = get_trip(trip_id)["photo_folder"]
+    backend = str(get_setting("BLOB_STORE", "")).lower()
+    if backend == "local":
+        root = get_setting("LOCAL_BLOB_DIR", LOCAL_BLOB_DIR)
+        return LocalBlobStore(os.path.join(root, folder), f"{LOCAL_BLOB_URL_PREFIX}/{folder}")
+    if backend in ("", "cloudinary") and get_setting("CLOUDINARY_CLOUD_NAME"):
+        return CloudinaryBlobStore(folder)
+    return None
+
+# =============================================================================
+# PHOTO DUPLICATE DETECTION
+# =============================================================================
+
+# 64-bit difference hash, split into bands for multi-index lookup. Any two hashes
+# within PHASH_MAX_DISTANCE bits must agree exactly on at least one band
+# (pigeonhole), so a lookup only compares against photos sharing a band value.
+PHASH_BANDS = 8
+PHASH_BAND_BITS = 64 // PHASH_BANDS
+PHASH_MAX_DISTANCE = PHASH_BANDS - 1
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def compute_phash(data: bytes) -> Optional[str]:
+    """Perceptual (difference) hash of an image as 16 hex chars, or None if unreadable."""
+    try:
+        img = Image.open(io.BytesIO(data))
+        # Let the JPEG decoder downscale while decoding - much cheaper than a full decode
+        img.draft("L", (64, 64))
+        pixels = list(img.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+    except Exception:
         return None
 
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (1 if left > right else 0)
+    return f"{bits:016x}"
+
+class PhotoHashIndex:
+    """Multi-index hash table over the perceptual hashes of uploaded photos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._rows_seen = 0
+        self._hashes = {}
+        self._bands = [{} for _ in range(PHASH_BANDS)]
+
+    @staticmethod
+    def _band_keys(value: int) -> list:
+        mask = (1 << PHASH_BAND_BITS) - 1
+        return [(value >> (i * PHASH_BAND_BITS)) & mask for i in range(PHASH_BANDS)]
+
+    def _add(self, phash: str, photo: dict):
+        value = int(phash, 16)
+        if value in self._hashes:
+            return
+        self._hashes[value] = photo
+        for band, key in zip(self._bands, self._band_keys(value)):
+            band.setdefault(key, []).append(value)
+
+    def add(self, phash: str, photo: dict):
+        """Index a photo's hash (photo is the info reported back on a match)."""
+        with self._lock:
+            self._add(phash, photo)
+
+    def sync(self, photos_df: pd.DataFrame):
+        """Index hashed Photos rows added since the last sync."""
+        with self._lock:
+            if len(photos_df) < self._rows_seen:
+                # The sheet was cleared or rewritten - start again
+                self._reset()
+            if "phash" in photos_df.columns:
+                new_rows = photos_df.iloc[self._rows_seen:]
+                hashed = new_rows[new_rows["phash"].notna() & (new_rows["phash"].astype(str) != "")]
+                for phash, uploader, image_url in zip(hashed["phash"], hashed["uploader"], hashed["image_url"]):
+                    self._add(str(phash), {"uploader": uploader, "image_url": image_url})
+            self._rows_seen = len(photos_df)
+
+    def find(self, phash: str) -> Optional[dict]:
+        """Closest indexed photo within PHASH_MAX_DISTANCE bits, or None."""
+        value = int(phash, 16)
+        best, best_distance = None, PHASH_MAX_DISTANCE + 1
+        with self._lock:
+            seen = set()
+            for band, key in zip(self._bands, self._band_keys(value)):
+                for candidate in band.get(key, ()):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    distance = bin(candidate ^ value).count("1")
+                    if distance < best_distance:
+                        best, best_distance = candidate, distance
+            if best is None:
+                return None
+            return {**self._hashes[best], "distance": best_distance}
+
+@st.cache_resource
+def get_photo_hash_index(trip_id: str) -> PhotoHashIndex:
+    """Process-wide perceptual hash index of a trip's uploaded photos."""
+    return PhotoHashIndex()
+
+def find_duplicate_uploads(uploaded_files: list, photos_df: pd.DataFrame) -> tuple:
+    """Hash each file and check it against the wall and earlier files in the same batch.
+
+    Returns (phashes, duplicates) where duplicates maps a file index to the match.
+    """
+    index = get_photo_hash_index(get_trip_id())
+    index.sync(committed_rows(photos_df))
+
+    phashes, duplicates = [], {}
+    batch_index = PhotoHashIndex()
+    for i, uploaded_file in enumerate(uploaded_files):
+        phash = compute_phash(uploaded_file.getvalue())
+        phashes.append(phash)
+        if phash is None:
+            continue
+        match = index.find(phash) or batch_index.find(phash)
+        if match:
+            duplicates[i] = match
+        else:
+            batch_index.add(phash, {"uploader": None, "image_url": None, "filename": uploaded_file.name})
+    return phashes, duplicates
+
 # =============================================================================
-# USER AUTHENTICATION
+# BACKGROUND PHOTO UPLOADS
 # =============================================================================
 
-USERS = ["JJ", "Henry", "James", "Dom", "Ash", "Max", "Gerard"]
+UPLOAD_WORKERS = 4
+UPLOAD_POLL_SECONDS = 2
+UPLOAD_ACTIVE_STATUSES = ("QUEUED", "UPLOADING", "SAVING")
+
+class UploadJobs:
+    """Thread-safe registry of background photo uploads and their progress.
+
+    Uploads are grouped into batches: each file uploads on its own worker, and
+    whichever worker finishes last writes every Photos row of the batch at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._batches = {}
+
+    def create_batch(self, user_id: str, filenames: list) -> tuple:
+        """Register a batch of queued uploads; returns (batch_id, job_ids)."""
+        batch_id = uuid.uuid4().hex
+        job_ids = [uuid.uuid4().hex for _ in filenames]
+        now = time.time()
+        with self._lock:
+            self._batches[batch_id] = {"pending": len(job_ids), "job_ids": job_ids, "rows": []}
+            for job_id, filename in zip(job_ids, filenames):
+                self._jobs[job_id] = {
+                    "id": job_id,
+                    "batch_id": batch_id,
+                    "user_id": user_id,
+                    "filename": filename,
+                    "status": "QUEUED",
+                    "progress": 0.0,
+                    "error": "",
+                    "created": now
+                }
+        return batch_id, job_ids
+
+    def update(self, job_id: str, **fields):
+        """Update the status/progress fields of a job."""
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def finish_upload(self, batch_id: str, row: Optional[dict]) -> Optional[list]:
+        """Record one finished transfer (row is None if it failed).
+
+        Returns the batch's collected rows when this was the last outstanding
+        transfer, otherwise None.
+        """
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return None
+            if row is not None:
+                batch["rows"].append(row)
+            batch["pending"] -= 1
+            if batch["pending"] > 0:
+                return None
+            del self._batches[batch_id]
+            return batch["rows"]
+
+    def for_user(self, user_id: str) -> list:
+        """Snapshot of a user's jobs, oldest first."""
+        with self._lock:
+            jobs = [dict(job) for job in self._jobs.values() if job["user_id"] == user_id]
+        return sorted(jobs, key=lambda job: job["created"])
+
+    def clear_finished(self, user_id: str):
+        """Forget a user's completed and failed jobs."""
+        with self._lock:
+            self._jobs = {
+                job_id: job for job_id, job in self._jobs.items()
+                if job["user_id"] != user_id or job["status"] in UPLOAD_ACTIVE_STATUSES
+            }
+
+@st.cache_resource
+def get_upload_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for photo uploads (bounds concurrent transfers)."""
+    return ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="photo-upload")
+
+@st.cache_resource
+def get_upload_jobs(trip_id: str) -> UploadJobs:
+    """A trip's upload job registry (survives reruns and is shared by sessions)."""
+    return UploadJobs()
+
+def _run_photo_upload(trip_id: str, jobs: UploadJobs, store: BlobStore, batch_id: str, job_id: str,
+                      user_id: str, filename: str, data: bytes, caption: str, phash: Optional[str]):
+    """Worker: push one image to the blob store; the batch's last worker commits the Photos rows."""
+    jobs.update(job_id, status="UPLOADING", progress=0.1)
+    row = None
+    try:
+        image_url = store.put(data, filename)
+        row = {
+            "uploader": user_id,
+            "caption": caption,
+            "image_url": image_url,
+            "timestamp": datetime.now().isoformat(),
+            "likes": 0,
+            "likers": "",
+            "phash": phash or ""
+        }
+        jobs.update(job_id, status="SAVING", progress=0.8, image_url=image_url)
+    except Exception as e:
+        jobs.update(job_id, status="FAILED", progress=1.0, error=f"Upload failed: {e}")
+
+    rows = jobs.finish_upload(batch_id, row)
+    if not rows:
+        return
+
+    # Last transfer of the batch - one write for all of its Photos rows
+    saved = append_rows_to_sheet("Photos", rows, trip_id=trip_id)
+    if saved:
+        index = get_photo_hash_index(trip_id)
+        for r in rows:
+            if r["phash"]:
+                index.add(r["phash"], {"uploader": r["uploader"], "image_url": r["image_url"]})
+    uploaded_urls = {r["image_url"] for r in rows}
+    for job in jobs.for_user(user_id):
+        if job.get("batch_id") != batch_id or job.get("image_url") not in uploaded_urls:
+            continue
+        if saved:
+            jobs.update(job["id"], status="DONE", progress=1.0)
+        else:
+            jobs.update(job["id"], status="FAILED", progress=1.0, error="Uploaded, but saving to Photos failed")
+
+def submit_photo_uploads(user_id: str, uploaded_files: list, caption: str, phashes: list) -> str:
+    """Hand uploaded files to the worker pool as one batch and return the batch id."""
+    # Read the bytes now - the UploadedFiles are gone after the next rerun
+    payloads = [(f.name, f.getvalue(), phash) for f, phash in zip(uploaded_files, phashes)]
+    trip_id = get_trip_id()
+    jobs = get_upload_jobs(trip_id)
+    store = get_blob_store(trip_id)
+    batch_id, job_ids = jobs.create_batch(user_id, [name for name, _, _ in payloads])
+    executor = get_upload_executor()
+    for job_id, (name, data, phash) in zip(job_ids, payloads):
+        executor.submit(_run_photo_upload, trip_id, jobs, store, batch_id, job_id, user_id, name, data, caption, phash)
+    return batch_id
+
+def _render_upload_jobs(user_id: str):
+    """Progress bars for the user's uploads; reruns the app once they finish."""
+    jobs = get_upload_jobs(get_trip_id()).for_user(user_id)
+    active = any(job["status"] in UPLOAD_ACTIVE_STATUSES for job in jobs)
+
+    if jobs:
+        st.markdown("### UPLOADS")
+        for job in jobs:
+            if job["status"] == "FAILED":
+                st.error(f"{job['filename']}: {job['error']}")
+            else:
+                st.progress(job["progress"], text=f"{job['filename']} - {job['status']}")
+
+        if not active and st.button("Clear finished uploads", key="clear_uploads", use_container_width=True):
+            get_upload_jobs(get_trip_id()).clear_finished(user_id)
+            st.rerun()
+
+    # Uploads just finished while polling - rerun the whole app so the gallery picks them up
+    if st.session_state.get("uploads_polling") and not active:
+        st.session_state["uploads_polling"] = False
+        st.rerun()
+    st.session_state["uploads_polling"] = active
+
+def render_upload_progress(user_id: str):
+    """Render upload progress, polling in a fragment only while uploads are in flight."""
+    active = any(job["status"] in UPLOAD_ACTIVE_STATUSES for job in get_upload_jobs(get_trip_id()).for_user(user_id))
+    st.fragment(run_every=UPLOAD_POLL_SECONDS if active else None)(_render_upload_jobs)(user_id)
+
+# =============================================================================
+# USER AUTHENTICATION
+# =============================================================================
 
 def render_login_page():
     """Render login page with user buttons."""
@@ -643,19 +2288,24 @@ def render_login_page():
     st.markdown("---")
 
     st.markdown("## Who are you?")
+    if get_trip_id() != DEFAULT_TRIP_ID:
+        st.markdown(f"**{get_trip()['name']}**")
     st.markdown("*Tap your name to enter*")
     st.markdown("")
 
     # Display user buttons in a grid
     cols = st.columns(2)
-    for i, user in enumerate(USERS):
+    for i, user in enumerate(get_roster()):
         with cols[i % 2]:
             if st.button(user, key=f"login_{user}", use_container_width=True):
                 st.session_state["authenticated_user"] = user
+                st.session_state["authenticated_trip"] = get_trip_id()
                 st.rerun()
 
 def get_current_user() -> Optional[str]:
-    """Get current user from session state."""
+    """Get current user from session state (None if they logged in to another trip)."""
+    if st.session_state.get("authenticated_trip", DEFAULT_TRIP_ID) != get_trip_id():
+        return None
     return st.session_state.get("authenticated_user", None)
 
 def check_user_submitted_rule(user_id: str) -> bool:
@@ -764,7 +2414,7 @@ def render_legislation_gate(user_id: str):
 
         submitted = st.form_submit_button("SUBMIT RULE", use_container_width=True)
 
-        if submitted:
+        if idem_key := submission_key("submit_rule", submitted):
             if rule_text and len(rule_text.strip()) > 10:
                 rule_data = {
                     "user_id": user_id,
@@ -772,7 +2422,7 @@ def render_legislation_gate(user_id: str):
                     "timestamp": datetime.now().isoformat(),
                     "votes": 0
                 }
-                if append_to_sheet("Rules", rule_data):
+                if append_to_sheet("Rules", rule_data, idem_key):
                     st.success("Rule submitted! Welcome to Dublin 2025!")
                     st.rerun()
             else:
@@ -790,7 +2440,7 @@ def render_fines_system(user_id: str):
 
     # Load existing rules and fines/inquiries
     rules_df = load_sheet_data("Rules")
-    inquiries_df = load_sheet_data("Inquiries")
+    fines_sheet = ShardedSheet("Inquiries")
 
     # Section A - Issue Fine Form
     with st.expander("ISSUE A FINE", expanded=False):
@@ -807,7 +2457,7 @@ def render_fines_system(user_id: str):
 
             evidence = st.text_area("Evidence/description (required):", max_chars=300, placeholder="Describe what happened...")
 
-            if st.form_submit_button("ISSUE FINE", use_container_width=True):
+            if idem_key := submission_key("issue_fine", st.form_submit_button("ISSUE FINE", use_container_width=True)):
                 if fined_person and rule_violated and evidence and len(evidence.strip()) > 0:
                     fine_data = {
                         "issuer": user_id,
@@ -816,7 +2466,7 @@ def render_fines_system(user_id: str):
                         "evidence": evidence.strip(),
                         "timestamp": datetime.now().isoformat()
                     }
-                    if append_to_sheet("Inquiries", fine_data):
+                    if append_to_sheet("Inquiries", fine_data, idem_key):
                         st.success(f"Fine issued to {fined_person}! (-5 pts)")
                         st.rerun()
                 else:
@@ -824,20 +2474,28 @@ def render_fines_system(user_id: str):
 
     # Section B - Rolling List of Fines
     st.markdown("### RECENT INFRINGEMENTS")
-    st.markdown("*Last 50 fines issued*")
-
+    fines_day = st.selectbox("Show:", ["Latest"] + fines_sheet.trip_days(), key="fines_day")
+    if fines_day == "Latest":
+        st.markdown("*Last 50 fines issued*")
+        recent_fines = fines_sheet.recent(50)
+        inquiries_df = recent_fines.last_n(len(recent_fines))
+    else:
+        # Just that day's shard (and the base worksheet), newest first
+        st.markdown(f"*Fines issued on {fines_day}*")
+        inquiries_df = fines_sheet.window(*trip_day_bounds(fines_day)).iloc[::-1]
     if inquiries_df.empty:
         st.info("No fines issued yet. Time to enforce the rules!")
     else:
         # Filter to only new fines format (records with 'fined_person' column)
         if 'fined_person' in inquiries_df.columns:
-            fines_df = inquiries_df[inquiries_df['fined_person'].notna()].copy()
+            # Newest first already - keep the first 50 of the latest
+            fines_df = inquiries_df[inquiries_df['fined_person'].notna()]
+            if fines_day == "Latest":
+                fines_df = fines_df.head(50)
 
             if fines_df.empty:
                 st.info("No fines issued yet. Time to enforce the rules!")
             else:
-                # Sort by timestamp descending (newest first) and limit to 50
-                fines_df = fines_df.sort_values('timestamp', ascending=False).head(50)
 
                 for idx, fine in fines_df.iterrows():
                     # Determine border color based on whether current user is fined
@@ -850,23 +2508,603 @@ def render_fines_system(user_id: str):
                     # Format timestamp
                     timestamp_str = fine['timestamp'][:16].replace('T', ' ')  # YYYY-MM-DD HH:MM
 
-                    st.markdown(f"""
-                    <div class="card" style="border-left: 4px solid {border_color};">
-                        <strong>💸 {fine['fined_person']}</strong> fined by <strong>{fine['issuer']}</strong><br>
-                        <span style="color: #555555; font-size: 0.9rem;">Rule: {rule_text}</span><br>
-                        <span style="color: #666666; font-size: 0.85rem;">Evidence: {evidence_text}</span><br>
-                        <span style="color: #888888; font-size: 0.75rem;">{timestamp_str}</span>
-                        <span style="background-color: #cc0000; color: #ffffff; padding: 2px 8px; margin-left: 10px; font-weight: bold; font-size: 0.8rem;">-5 pts</span>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(f"""
+                    <div class="card" style="border-left: 4px solid {border_color};">
+                        <strong>💸 {fine['fined_person']}</strong> fined by <strong>{fine['issuer']}</strong><br>
+                        <span style="color: #555555; font-size: 0.9rem;">Rule: {rule_text}</span><br>
+                        <span style="color: #666666; font-size: 0.85rem;">Evidence: {evidence_text}</span><br>
+                        <span style="color: #888888; font-size: 0.75rem;">{timestamp_str}</span>{pending_badge(fine)}
+                        <span style="background-color: #cc0000; color: #ffffff; padding: 2px 8px; margin-left: 10px; font-weight: bold; font-size: 0.8rem;">-5 pts</span>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                    st.markdown("")
+        else:
+            st.info("No fines issued yet. Time to enforce the rules!")
+
+# =============================================================================
+# ODDS ENGINE
+# =============================================================================
+
+DEFAULT_EW_PLACES = 3
+DEFAULT_EW_PLACE_FRACTION = 4  # each-way place part pays 1/4 of the odds
+
+def fractional_to_decimal(num: int, den: int) -> Fraction:
+    """Decimal odds (total return per unit staked) for fractional odds num/den."""
+    return Fraction(int(num), int(den)) + 1
+
+def decimal_to_fractional(decimal_odds, max_den: int = 100) -> Optional[tuple]:
+    """Nearest fractional odds (numerator, denominator) for a decimal price."""
+    price = Fraction(str(decimal_odds)).limit_denominator(max_den) - 1
+    if price <= 0:
+        return None
+    return (price.numerator, price.denominator)
+
+def implied_probability(num: int, den: int) -> float:
+    """Chance of winning implied by fractional odds num/den."""
+    return den / (num + den)
+
+def odds_columns(bets_df: pd.DataFrame) -> tuple:
+    """Integer (numerator, denominator) odds columns of a Bets frame."""
+    num = pd.to_numeric(bets_df["odds_num"], errors="coerce").fillna(0).astype("int64")
+    den = pd.to_numeric(bets_df["odds_den"], errors="coerce").fillna(1).astype("int64").clip(lower=1)
+    return num, den
+
+def implied_probabilities(bets_df: pd.DataFrame) -> pd.Series:
+    """Implied win probability of every bet, vectorized over the frame."""
+    num, den = odds_columns(bets_df)
+    return den / (num + den)
+
+def accumulator_odds(legs: list) -> tuple:
+    """Combined fractional odds of an accumulator from its legs' (num, den) odds, exactly."""
+    price = Fraction(1)
+    for num, den in legs:
+        price *= fractional_to_decimal(num, den)
+    price -= 1
+    return (price.numerator, price.denominator)
+
+def each_way_returns(stake_per_part: float, num: int, den: int, place_fraction: int) -> dict:
+    """Returns of a bet at num/den: win_only for a win bet of stake_per_part;
+    win_and_place and place_only for an each-way bet of stake_per_part per half."""
+    unit = Fraction(str(stake_per_part))
+    win = unit * fractional_to_decimal(num, den)
+    place = unit * (Fraction(int(num), int(den) * int(place_fraction)) + 1)
+    return {
+        "win_only": round(float(win), 2),
+        "win_and_place": round(float(win + place), 2),
+        "place_only": round(float(place), 2)
+    }
+
+def _div_round_half_up(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """numerator / denominator rounded half-up, in integers."""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+def payout_cents(stake_cents: pd.Series, num: pd.Series, den: pd.Series, each_way: pd.Series,
+                 place_fraction: pd.Series, won: pd.Series, placed: pd.Series) -> pd.Series:
+    """Exact payout in cents for each bet given whether it won and whether it placed.
+
+    Win bets return stake * (num + den) / den when they win. Each-way bets
+    stake half on the win and half on a place at num / (den * place_fraction).
+    """
+    win_cents = _div_round_half_up(stake_cents * (num + den), den).where(won, 0)
+    ew_cents = _div_round_half_up(
+        stake_cents * (
+            (num + den) * place_fraction * won.astype("int64")
+            + (den * place_fraction + num) * placed.astype("int64")
+        ),
+        2 * den * place_fraction
+    )
+    return win_cents.where(~each_way, ew_cents)
+
+def race_overround(bets_df: pd.DataFrame, racecard=None) -> pd.Series:
+    """Book percentage per race: the summed implied probabilities of its runners.
+
+    Uses the full field from the racecard where there is one, otherwise the
+    distinct horses backed in the Bets frame (a partial book).
+    """
+    singles = bets_df[_bet_column(bets_df, "bet_type", "WIN") != "ACCA"]
+    book = pd.DataFrame({
+        "race": pd.to_numeric(singles["race_num"], errors="coerce"),
+        "horse": singles["horse"].map(normalize_horse_name),
+        "probability": implied_probabilities(singles)
+    }).drop_duplicates(["race", "horse"]).groupby("race")["probability"].sum()
+
+    if racecard:
+        card_book = pd.Series({
+            race_num: sum(implied_probability(*runner["odds"]) for runner in racecard.runners(race_num) if runner["odds"])
+            for race_num in racecard.race_numbers()
+        }, dtype=float)
+        book = card_book[card_book > 0].combine_first(book)
+    return book * 100
+
+# =============================================================================
+# RACECARD
+# =============================================================================
+
+def normalize_horse_name(name) -> str:
+    """Comparison key for a horse name: case, spacing and punctuation ignored."""
+    text = re.sub(r"['\u2019]", "", str(name).lower())
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text).split())
+
+RACECARD_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "racecard.json")
+
+def parse_fractional_odds(odds) -> Optional[tuple]:
+    """Parse '5/2', 'Evens' or a decimal price like '3.5' into (numerator, denominator)."""
+    text = str(odds).strip().lower()
+    if text in ("evs", "evens", "even", "1/1"):
+        return (1, 1)
+    try:
+        if "/" in text:
+            num, den = (int(part) for part in text.split("/", 1))
+            price = Fraction(num, den)
+        else:
+            # Decimal odds include the stake
+            return decimal_to_fractional(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+    if price <= 0:
+        return None
+    return (price.numerator, price.denominator)
+
+class Racecard:
+    """The meeting's races and runners, indexed by race and by (race, horse).
+
+    Loaded from a local JSON file shaped like
+    {"meeting": ..., "races": [{"race_num", "time", "name", "runners": [{"no", "horse", "odds"}]}]}
+    or a flat CSV with race_num, race_time, race_name, runner_no, horse, odds columns.
+    """
+
+    def __init__(self, meeting: str, races: dict):
+        self.meeting = meeting
+        self.races = races
+        self._runners = {
+            (race_num, normalize_horse_name(runner["horse"])): runner
+            for race_num, race in races.items()
+            for runner in race["runners"]
+        }
+
+    @classmethod
+    def from_rows(cls, meeting: str, rows: list) -> "Racecard":
+        """Build from flat runner rows (race_num, race_time, race_name, runner_no, horse, odds)."""
+        races = {}
+        for row in rows:
+            if not row.get("horse"):
+                continue
+            race_num = int(row["race_num"])
+            race = races.setdefault(race_num, {
+                "race_num": race_num,
+                "time": str(row.get("race_time") or ""),
+                "name": str(row.get("race_name") or ""),
+                "runners": []
+            })
+            race["runners"].append({
+                "race_num": race_num,
+                "no": int(row["runner_no"]) if str(row.get("runner_no") or "").strip() else len(race["runners"]) + 1,
+                "horse": str(row["horse"]).strip(),
+                "odds": parse_fractional_odds(row.get("odds", ""))
+            })
+        for race in races.values():
+            race["runners"].sort(key=lambda runner: runner["no"])
+        return cls(meeting, dict(sorted(races.items())))
+
+    @classmethod
+    def load(cls, path: str) -> "Racecard":
+        """Read a racecard from a .json or .csv file."""
+        if path.lower().endswith(".csv"):
+            with open(path, newline="", encoding="utf-8") as f:
+                return cls.from_rows("", list(csv.DictReader(f)))
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        rows = [
+            {
+                "race_num": race["race_num"],
+                "race_time": race.get("time", ""),
+                "race_name": race.get("name", ""),
+                "runner_no": runner.get("no", ""),
+                "horse": runner.get("horse", ""),
+                "odds": runner.get("odds", "")
+            }
+            for race in data.get("races", [])
+            for runner in race.get("runners", [])
+        ]
+        return cls.from_rows(data.get("meeting", ""), rows)
+
+    def race_numbers(self) -> list:
+        return list(self.races.keys())
+
+    def race_label(self, race_num: int) -> str:
+        race = self.races[race_num]
+        details = " - ".join(part for part in (race["time"], race["name"]) if part)
+        return f"Race {race_num}" + (f" - {details}" if details else "")
+
+    def runners(self, race_num: int) -> list:
+        return self.races.get(race_num, {}).get("runners", [])
+
+    def runner(self, race_num: int, horse: str) -> Optional[dict]:
+        """Look up a runner by race and (normalized) horse name."""
+        return self._runners.get((race_num, normalize_horse_name(horse)))
+
+@st.cache_resource
+def _load_racecard(path: str, mtime: float) -> Optional[Racecard]:
+    """Parse and index the racecard once per file version."""
+    try:
+        return Racecard.load(path)
+    except Exception as e:
+        st.error(f"Could not read racecard {os.path.basename(path)}: {e}")
+        return None
+
+def get_racecard() -> Optional[Racecard]:
+    """The meeting's racecard from RACECARD_PATH (.json or .csv), if there is one."""
+    path = str(get_setting("RACECARD_PATH", RACECARD_PATH))
+    if not os.path.exists(path):
+        csv_path = os.path.splitext(path)[0] + ".csv"
+        if not os.path.exists(csv_path):
+            return None
+        path = csv_path
+    return _load_racecard(path, os.path.getmtime(path))
+
+# =============================================================================
+# FEATURE: LEOPARDSTOWN LEDGER
+# =============================================================================
+
+BET_RESULT_COLORS = {
+    "PENDING": "#cc9900",
+    "WIN": "#00802b",
+    "PLACED": "#0066cc",
+    "LOSS": "#cc0000"
+}
+# Results that pay out (PLACED: only the place half of an each-way bet came in)
+BET_PAYING_RESULTS = ["WIN", "PLACED"]
+BET_TYPE_LABELS = {"WIN": "Win", "EW": "Each-Way", "ACCA": "Accumulator"}
+
+def _bet_column(bets_df: pd.DataFrame, column: str, default) -> pd.Series:
+    """A Bets column with a default for rows (or sheets) that predate it."""
+    if column not in bets_df.columns:
+        return pd.Series(default, index=bets_df.index)
+    return bets_df[column].fillna(default)
+
+def _bet_terms(bets_df: pd.DataFrame) -> tuple:
+    """Integer stake (cents), odds and each-way terms columns of a Bets frame."""
+    stake_cents = (pd.to_numeric(bets_df["stake"], errors="coerce").fillna(0) * 100).round().astype("int64")
+    num, den = odds_columns(bets_df)
+    each_way = _bet_column(bets_df, "bet_type", "WIN") == "EW"
+    places = pd.to_numeric(
+        _bet_column(bets_df, "places", DEFAULT_EW_PLACES), errors="coerce"
+    ).fillna(DEFAULT_EW_PLACES).astype("int64")
+    place_fraction = pd.to_numeric(
+        _bet_column(bets_df, "place_fraction", DEFAULT_EW_PLACE_FRACTION), errors="coerce"
+    ).fillna(DEFAULT_EW_PLACE_FRACTION).astype("int64").clip(lower=1)
+    return stake_cents, num, den, each_way, places, place_fraction
+
+def compute_bet_returns(bets_df: pd.DataFrame) -> pd.DataFrame:
+    """Add return figures to the Bets frame, computed vectorized in exact integer cents.
+
+    potential_return is what the bet pays if it wins (for each-way, if it wins
+    and so also places), rounded half-up to the cent using integer arithmetic
+    only (no float drift). profit is the settled result: payout - stake for a
+    paying result, -stake for a LOSS, 0 while PENDING.
+    """
+    stake_cents, num, den, each_way, _, place_fraction = _bet_terms(bets_df)
+    all_true = pd.Series(True, index=bets_df.index)
+    potential_cents = payout_cents(stake_cents, num, den, each_way, place_fraction, all_true, all_true)
+
+    paid_cents = (pd.to_numeric(bets_df["payout"], errors="coerce").fillna(0) * 100).round().astype("int64")
+    result = bets_df["result"]
+    profit_cents = (
+        (paid_cents - stake_cents).where(result.isin(BET_PAYING_RESULTS), 0)
+        - stake_cents.where(result == "LOSS", 0)
+    )
+
+    return bets_df.assign(
+        potential_return=potential_cents / 100,
+        profit=profit_cents / 100
+    )
+
+def _horse_key(horse, runner_no, race_num: int, racecard: Optional[Racecard]) -> str:
+    """Match key for a horse in a race: the racecard runner number where known, else the normalized name."""
+    if pd.notna(runner_no) and str(runner_no).strip() not in ("", "nan"):
+        return f"#{int(float(runner_no))}"
+    runner = racecard.runner(race_num, horse) if racecard else None
+    return f"#{runner['no']}" if runner else normalize_horse_name(horse)
+
+def _race_horse_keys(horses: pd.Series, runner_nos: pd.Series, race_num: int, racecard: Optional[Racecard]) -> pd.Series:
+    """Match keys for a column of horses in one race."""
+    return pd.Series([_horse_key(h, n, race_num, racecard) for h, n in zip(horses, runner_nos)], index=horses.index)
+
+def parse_acca_legs(legs) -> list:
+    """Accumulator legs stored as JSON in the Bets 'legs' column."""
+    try:
+        return json.loads(legs) if isinstance(legs, str) and legs else []
+    except ValueError:
+        return []
+
+def _settle_accumulators(bets_df: pd.DataFrame, race_num: int, winner_key: str,
+                         racecard: Optional[Racecard]) -> tuple:
+    """Mark pending accumulator legs in this race; an acca wins once every leg has won."""
+    accas = bets_df[(_bet_column(bets_df, "bet_type", "WIN") == "ACCA") & (bets_df["result"] == "PENDING")]
+    settled = 0
+    for idx, legs_json in zip(accas.index, _bet_column(accas, "legs", "")):
+        legs = parse_acca_legs(legs_json)
+        touched = False
+        for leg in legs:
+            if int(leg["race_num"]) == race_num and leg.get("result", "PENDING") == "PENDING":
+                leg_key = _horse_key(leg["horse"], leg.get("runner_no", ""), race_num, racecard)
+                leg["result"] = "WIN" if leg_key == winner_key else "LOSS"
+                touched = True
+        if not touched:
+            continue
+
+        bets_df.loc[idx, "legs"] = json.dumps(legs)
+        if any(leg["result"] == "LOSS" for leg in legs):
+            bets_df.loc[idx, ["result", "payout"]] = ["LOSS", 0]
+            settled += 1
+        elif all(leg["result"] == "WIN" for leg in legs):
+            potential = compute_bet_returns(bets_df.loc[[idx]])["potential_return"].iloc[0]
+            bets_df.loc[idx, ["result", "payout"]] = ["WIN", potential]
+            settled += 1
+    return bets_df, settled
+
+def settle_race(bets_df: pd.DataFrame, race_num: int, winner: str, placed: list,
+                racecard: Optional[Racecard] = None) -> tuple:
+    """Settle every PENDING bet on a race from its result.
+
+    placed lists the horses that finished 2nd, 3rd, ... in order. Bets match
+    the result by racecard runner number when there is a racecard entry, or by
+    normalized horse name otherwise. Win bets pay if they backed the winner.
+    Each-way bets (bet_type "EW") are two equal halves: the win half on the
+    winner, and the place half at 1/place_fraction of the odds on any horse
+    finishing in the first `places`. Accumulator legs in this race are marked
+    and the acca settles once its outcome is known. Payouts are exact
+    integer-cent arithmetic, vectorized over the race.
+
+    Returns (updated bets frame, number of bets settled).
+    """
+    finish = pd.Series([winner] + list(placed))
+    finish_order = list(_race_horse_keys(finish, pd.Series("", index=finish.index), race_num, racecard))
+    updated = bets_df.assign(payout=pd.to_numeric(bets_df["payout"], errors="coerce").fillna(0).astype(float))
+    updated, settled = _settle_accumulators(updated, race_num, finish_order[0], racecard)
+
+    pending = (
+        (pd.to_numeric(updated["race_num"], errors="coerce") == race_num)
+        & (updated["result"] == "PENDING")
+        & (_bet_column(updated, "bet_type", "WIN") != "ACCA")
+    )
+    if not pending.any():
+        return updated, settled
+
+    race_bets = updated[pending]
+    # With a racecard, bets and result match on runner number rather than spelling
+    horse_keys = _race_horse_keys(race_bets["horse"], _bet_column(race_bets, "runner_no", ""), race_num, racecard)
+    stake_cents, num, den, each_way, places, place_fraction = _bet_terms(race_bets)
+
+    won = horse_keys == finish_order[0]
+    finish_position = horse_keys.map({key: pos for pos, key in reversed(list(enumerate(finish_order, start=1)))})
+    in_places = finish_position.notna() & (finish_position <= places)
+
+    paid_cents = payout_cents(stake_cents, num, den, each_way, place_fraction, won, in_places)
+    results = pd.Series("LOSS", index=race_bets.index)
+    results[each_way & in_places & ~won] = "PLACED"
+    results[won] = "WIN"
+
+    updated.loc[race_bets.index, "result"] = results
+    updated.loc[race_bets.index, "payout"] = paid_cents / 100
+    return updated, settled + len(race_bets)
+
+def bet_key(bet) -> dict:
+    """Columns identifying a Bets row: a punter never places two bets in the same instant."""
+    return {"user_id": bet["user_id"], "timestamp": bet["timestamp"]}
+
+def settlement_ops(bets_df: pd.DataFrame, updated: pd.DataFrame) -> list:
+    """Commit ops writing the result, payout and legs of every bet `updated` changed."""
+    columns = [col for col in ["result", "payout", "legs"] if col in updated.columns]
+    before = bets_df[columns].map(_cell_key)
+    changed = (before != updated[columns].map(_cell_key)).any(axis=1)
+    return [
+        op_update_where(bet_key(bet), {col: bet[col] for col in columns})
+        for _, bet in updated[changed].iterrows()
+    ]
+
+def pending_races(bets_df: pd.DataFrame) -> list:
+    """Race numbers with a pending single bet or a pending accumulator leg."""
+    pending = bets_df[bets_df["result"] == "PENDING"]
+    is_acca = _bet_column(pending, "bet_type", "WIN") == "ACCA"
+    races = set(pd.to_numeric(pending.loc[~is_acca, "race_num"], errors="coerce").dropna().astype(int))
+    for legs in _bet_column(pending, "legs", "")[is_acca]:
+        races.update(int(leg["race_num"]) for leg in parse_acca_legs(legs) if leg.get("result", "PENDING") == "PENDING")
+    return sorted(races)
+
+def race_places_paid(bets_df: pd.DataFrame, race_num: int) -> int:
+    """Most places paid by any pending each-way bet on a race (0 if there are none)."""
+    pending = bets_df[
+        (bets_df["result"] == "PENDING") & (pd.to_numeric(bets_df["race_num"], errors="coerce") == race_num)
+    ]
+    _, _, _, each_way, places, _ = _bet_terms(pending)
+    return int(places[each_way].max()) if each_way.any() else 0
+
+def render_race_settlement(bets_df: pd.DataFrame, racecard: Optional[Racecard]):
+    """Enter a race result and settle every pending bet on that race in one write."""
+    races = pending_races(bets_df)
+    if not races:
+        return
+
+    with st.expander("SETTLE A RACE", expanded=False):
+        race_num = st.selectbox(
+            "Race #:",
+            options=races,
+            format_func=lambda r: racecard.race_label(r) if racecard and r in racecard.races else f"Race {r}",
+            key="settle_race_num"
+        )
+
+        if racecard and racecard.runners(race_num):
+            backed = [runner["horse"] for runner in racecard.runners(race_num)]
+        else:
+            pending_bets = bets_df[bets_df["result"] == "PENDING"]
+            backed = set(pending_bets.loc[
+                pd.to_numeric(pending_bets["race_num"], errors="coerce") == race_num, "horse"
+            ].astype(str).str.strip())
+            for legs in _bet_column(pending_bets, "legs", ""):
+                backed.update(leg["horse"] for leg in parse_acca_legs(legs) if int(leg["race_num"]) == race_num)
+            backed = sorted(backed)
+        unbacked = "Another horse (not backed)"
+        not_placed = "-"
+
+        winner = st.selectbox("Winner:", options=backed + [unbacked], key=f"settle_winner_{race_num}")
+        placed = []
+        # Enough placings for the most generous each-way terms on the race
+        place_cols = st.columns(max(DEFAULT_EW_PLACES, race_places_paid(bets_df, race_num) - 1))
+        for i, col in enumerate(place_cols, start=2):
+            with col:
+                placed.append(st.selectbox(
+                    f"{i}{'nd' if i == 2 else 'rd' if i == 3 else 'th'}:",
+                    options=[not_placed] + backed,
+                    key=f"settle_place_{race_num}_{i}"
+                ))
+        st.caption("Placings only matter for each-way bets.")
+
+        if st.button(f"SETTLE RACE {race_num}", use_container_width=True):
+            updated_df, settled = settle_race(
+                bets_df,
+                race_num,
+                "" if winner == unbacked else winner,
+                [h for h in placed if h != not_placed],
+                racecard
+            )
+            if settled and commit_ops("Bets", settlement_ops(bets_df, updated_df)):
+                st.success(f"Settled {settled} bet{'s' if settled != 1 else ''} on Race {race_num}!")
+                st.rerun()
+            elif not settled:
+                st.success(f"Race {race_num} recorded - accumulators still have legs to run.")
+
+def render_bet_form(user_id: str, racecard: Optional[Racecard]):
+    """Bet slip for win, each-way and accumulator bets.
+
+    With a racecard, pick the race and runner and the odds pre-fill from the
+    card. Previews are priced locally by the odds engine on every change.
+    """
+    bet_type_label = st.radio("Bet type:", list(BET_TYPE_LABELS.values()), horizontal=True, key="bet_type")
+    bet_type = next(code for code, label in BET_TYPE_LABELS.items() if label == bet_type_label)
+
+    runner = None
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if racecard:
+            race_num = st.selectbox("Race #:", options=racecard.race_numbers(), format_func=racecard.race_label, key="bet_race")
+        else:
+            race_num = st.number_input("Race #:", min_value=1, max_value=20, value=1, key="bet_race")
+    with col2:
+        stake_label = "Stake per part (EUR):" if bet_type == "EW" else "Stake (EUR):"
+        stake = st.number_input(stake_label, min_value=1.0, max_value=1000.0, value=10.0, step=5.0, key="bet_stake")
+
+    if racecard and racecard.runners(race_num):
+        runner = st.selectbox(
+            "Horse:",
+            options=racecard.runners(race_num),
+            format_func=lambda r: f"{r['no']}. {r['horse']}" + (f" ({r['odds'][0]}/{r['odds'][1]})" if r["odds"] else ""),
+            key=f"bet_runner_{race_num}"
+        )
+        horse = runner["horse"]
+    else:
+        horse = st.text_input("Horse Name:", placeholder="e.g., Lucky Charm", key="bet_horse")
+
+    # Fractional odds input - defaults come from the card, keyed per runner so they reset on change
+    default_num, default_den = runner["odds"] if runner and runner["odds"] else (5, 1)
+    odds_key = f"{race_num}_{runner['no']}" if runner else "manual"
+    st.markdown("**Fractional Odds:**")
+    odds_col1, odds_col2 = st.columns(2)
+    with odds_col1:
+        odds_num = st.number_input("Numerator:", min_value=1, max_value=1000, value=int(default_num), key=f"bet_odds_num_{odds_key}")
+    with odds_col2:
+        odds_den = st.number_input("Denominator:", min_value=1, max_value=100, value=int(default_den), key=f"bet_odds_den_{odds_key}")
+
+    st.caption(
+        f"{odds_num}/{odds_den} = {float(fractional_to_decimal(odds_num, odds_den)):.2f} decimal"
+        f" | {implied_probability(odds_num, odds_den):.0%} implied chance"
+    )
+
+    bet_data = None
+
+    if bet_type == "WIN":
+        returns = each_way_returns(stake, odds_num, odds_den, DEFAULT_EW_PLACE_FRACTION)["win_only"]
+        st.markdown(f"**Odds: {odds_num}/{odds_den}** (Potential return: EUR {returns:.2f})")
+        if st.button("PLACE BET", key="place_bet", use_container_width=True):
+            if horse and horse.strip():
+                bet_data = {"race_num": race_num, "horse": horse.strip(), "stake": stake,
+                            "odds_num": odds_num, "odds_den": odds_den, "bet_type": "WIN"}
+            else:
+                st.error("Please enter a horse name.")
+
+    elif bet_type == "EW":
+        ew_col1, ew_col2 = st.columns(2)
+        with ew_col1:
+            places = st.number_input("Places paid:", min_value=1, max_value=6, value=DEFAULT_EW_PLACES, key="bet_ew_places")
+        with ew_col2:
+            place_fraction = st.selectbox("Place terms:", options=[4, 5], format_func=lambda f: f"1/{f} odds", key="bet_ew_terms")
+        returns = each_way_returns(stake, odds_num, odds_den, place_fraction)
+        st.markdown(
+            f"**EUR {stake:.2f} each-way @ {odds_num}/{odds_den}** (total stake EUR {2 * stake:.2f})<br>"
+            f"Wins: EUR {returns['win_and_place']:.2f} | Places only: EUR {returns['place_only']:.2f}",
+            unsafe_allow_html=True
+        )
+        if st.button("PLACE EACH-WAY BET", key="place_bet", use_container_width=True):
+            if horse and horse.strip():
+                bet_data = {"race_num": race_num, "horse": horse.strip(), "stake": 2 * stake,
+                            "odds_num": odds_num, "odds_den": odds_den, "bet_type": "EW",
+                            "places": places, "place_fraction": place_fraction}
+            else:
+                st.error("Please enter a horse name.")
+
+    else:
+        legs = st.session_state.setdefault("acca_legs", [])
+        if st.button("ADD LEG", key="acca_add_leg", use_container_width=True):
+            if not horse or not horse.strip():
+                st.error("Please enter a horse name.")
+            elif any(int(leg["race_num"]) == int(race_num) for leg in legs):
+                st.error(f"Already have a leg in Race {race_num}.")
+            else:
+                legs.append({"race_num": int(race_num), "horse": horse.strip(),
+                             "runner_no": runner["no"] if runner else "",
+                             "odds": [int(odds_num), int(odds_den)], "result": "PENDING"})
+                st.rerun()
+
+        for i, leg in enumerate(legs):
+            leg_col1, leg_col2 = st.columns([4, 1])
+            with leg_col1:
+                st.markdown(f"Race {leg['race_num']}: **{leg['horse']}** @ {leg['odds'][0]}/{leg['odds'][1]}")
+            with leg_col2:
+                if st.button("✕", key=f"acca_remove_{i}"):
+                    legs.pop(i)
+                    st.rerun()
 
-                    st.markdown("")
+        if len(legs) >= 2:
+            acca_num, acca_den = accumulator_odds([tuple(leg["odds"]) for leg in legs])
+            returns = each_way_returns(stake, acca_num, acca_den, DEFAULT_EW_PLACE_FRACTION)["win_only"]
+            st.markdown(
+                f"**{len(legs)}-fold @ {acca_num}/{acca_den}**"
+                f" ({implied_probability(acca_num, acca_den):.1%} implied) - Potential return: EUR {returns:.2f}"
+            )
+            if st.button("PLACE ACCUMULATOR", key="place_bet", use_container_width=True):
+                legs = sorted(legs, key=lambda leg: leg["race_num"])
+                bet_data = {"race_num": legs[-1]["race_num"],
+                            "horse": " + ".join(leg["horse"] for leg in legs),
+                            "stake": stake, "odds_num": acca_num, "odds_den": acca_den,
+                            "bet_type": "ACCA", "legs": json.dumps(legs)}
         else:
-            st.info("No fines issued yet. Time to enforce the rules!")
-
-# =============================================================================
-# FEATURE: LEOPARDSTOWN LEDGER
-# =============================================================================
+            st.caption("Add at least two legs from different races.")
+
+    if idem_key := submission_key("place_bet", bool(bet_data)):
+        bet_data = {
+            "user_id": user_id,
+            **bet_data,
+            "timestamp": datetime.now().isoformat(),
+            "result": "PENDING",
+            "payout": 0,
+            "runner_no": runner["no"] if runner and bet_type != "ACCA" else ""
+        }
+        if append_to_sheet("Bets", bet_data, idem_key):
+            st.session_state.pop("acca_legs", None)
+            st.success(f"Bet placed on {bet_data['horse']}!")
+            st.rerun()
 
 def render_leopardstown_ledger(user_id: str):
     """Render the race betting tracker."""
@@ -876,46 +3114,17 @@ def render_leopardstown_ledger(user_id: str):
 
     bets_df = load_sheet_data("Bets")
 
+    racecard = get_racecard()
+
     # Place new bet
     with st.expander("PLACE NEW BET", expanded=False):
-        with st.form("new_bet"):
-            col1, col2 = st.columns(2)
-
-            with col1:
-                race_num = st.number_input("Race #:", min_value=1, max_value=10, value=1)
-            with col2:
-                stake = st.number_input("Stake (EUR):", min_value=1.0, max_value=1000.0, value=10.0, step=5.0)
+        render_bet_form(user_id, racecard)
 
-            horse = st.text_input("Horse Name:", placeholder="e.g., Lucky Charm")
+    if not bets_df.empty:
+        render_race_settlement(bets_df, racecard)
 
-            # Fractional odds input
-            st.markdown("**Fractional Odds:**")
-            odds_col1, odds_col2 = st.columns(2)
-            with odds_col1:
-                odds_num = st.number_input("Numerator:", min_value=1, max_value=100, value=5)
-            with odds_col2:
-                odds_den = st.number_input("Denominator:", min_value=1, max_value=20, value=1)
-
-            st.markdown(f"**Odds: {odds_num}/{odds_den}** (Potential return: EUR {stake * (odds_num/odds_den + 1):.2f})")
-
-            if st.form_submit_button("PLACE BET", use_container_width=True):
-                if horse:
-                    bet_data = {
-                        "user_id": user_id,
-                        "race_num": race_num,
-                        "horse": horse.strip(),
-                        "stake": stake,
-                        "odds_num": odds_num,
-                        "odds_den": odds_den,
-                        "timestamp": datetime.now().isoformat(),
-                        "result": "PENDING",
-                        "payout": 0
-                    }
-                    if append_to_sheet("Bets", bet_data):
-                        st.success(f"Bet placed on {horse}!")
-                        st.rerun()
-                else:
-                    st.error("Please enter a horse name.")
+    # One pass to add returns, then one groupby each for the user and race views
+    ledger_df = compute_bet_returns(bets_df) if not bets_df.empty else bets_df
 
     # Display user's bets
     st.markdown("### YOUR BETS")
@@ -923,24 +3132,43 @@ def render_leopardstown_ledger(user_id: str):
     if bets_df.empty:
         st.info("No bets placed yet. Feeling lucky?")
     else:
-        user_bets = bets_df[bets_df["user_id"] == user_id]
+        bets_by_user = dict(tuple(ledger_df.groupby("user_id", sort=False)))
+        user_bets = bets_by_user.get(user_id)
 
-        if user_bets.empty:
+        if user_bets is None:
             st.info("You haven't placed any bets yet.")
         else:
+            staked = pd.to_numeric(user_bets["stake"], errors="coerce").sum()
+            settled_profit = user_bets["profit"].sum()
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Staked", f"EUR {staked:.2f}")
+            with col2:
+                st.metric("P&L", f"EUR {settled_profit:+.2f}")
+
             for idx, bet in user_bets.iterrows():
-                result_color = {
-                    "PENDING": "#cc9900",
-                    "WIN": "#00802b",
-                    "LOSS": "#cc0000"
-                }.get(bet["result"], "#000000")
+                result_color = BET_RESULT_COLORS.get(bet["result"], "#000000")
+
+                result_detail = ""
+                if bet["result"] in BET_PAYING_RESULTS:
+                    result_detail = f" | Payout: EUR {bet['payout']}"
+                elif bet["result"] == "PENDING":
+                    result_detail = f" | Returns EUR {bet['potential_return']:.2f} if it wins"
+
+                bet_type = bet.get("bet_type") if pd.notna(bet.get("bet_type")) else "WIN"
+                title = f"Race {bet['race_num']}</strong> - {bet['horse']}"
+                if bet_type == "ACCA":
+                    legs = parse_acca_legs(bet.get("legs"))
+                    title = f"{len(legs)}-fold Accumulator</strong><br>" + "<br>".join(
+                        f"Race {leg['race_num']}: {leg['horse']} ({leg.get('result', 'PENDING')})" for leg in legs
+                    )
 
                 st.markdown(f"""
                 <div class="card" style="border-left: 4px solid {result_color};">
-                    <strong>Race {bet['race_num']}</strong> - {bet['horse']}<br>
-                    Stake: EUR {bet['stake']} @ {bet['odds_num']}/{bet['odds_den']}<br>
+                    <strong>{title}<br>
+                    {BET_TYPE_LABELS.get(bet_type, "Win")} | Stake: EUR {bet['stake']} @ {bet['odds_num']}/{bet['odds_den']}<br>
                     <strong style="color: {result_color}; font-weight: bold;">{bet['result']}</strong>
-                    {f" | Payout: EUR {bet['payout']}" if bet['result'] == 'WIN' else ''}
+                    {result_detail}{pending_badge(bet)}
                 </div>
                 """, unsafe_allow_html=True)
 
@@ -949,17 +3177,12 @@ def render_leopardstown_ledger(user_id: str):
                     col1, col2 = st.columns(2)
                     with col1:
                         if st.button("WON", key=f"win_{idx}", use_container_width=True):
-                            payout = bet["stake"] * (bet["odds_num"] / bet["odds_den"] + 1)
-                            bets_df.loc[idx, "result"] = "WIN"
-                            bets_df.loc[idx, "payout"] = round(payout, 2)
-                            update_sheet("Bets", bets_df)
-                            st.rerun()
+                            if commit_ops("Bets", [op_update_where(bet_key(bet), {"result": "WIN", "payout": float(bet["potential_return"])})]):
+                                st.rerun()
                     with col2:
                         if st.button("LOST", key=f"loss_{idx}", use_container_width=True):
-                            bets_df.loc[idx, "result"] = "LOSS"
-                            bets_df.loc[idx, "payout"] = 0
-                            update_sheet("Bets", bets_df)
-                            st.rerun()
+                            if commit_ops("Bets", [op_update_where(bet_key(bet), {"result": "LOSS", "payout": 0})]):
+                                st.rerun()
 
     # Display all bets by race
     st.markdown("---")
@@ -968,24 +3191,18 @@ def render_leopardstown_ledger(user_id: str):
     if bets_df.empty:
         st.info("No bets placed by anyone yet.")
     else:
-        # Get unique race numbers and sort them
-        races = sorted(bets_df["race_num"].unique())
-
-        for race in races:
-            race_bets = bets_df[bets_df["race_num"] == race]
-
-            st.markdown(f"#### Race {int(race)}")
+        overround = race_overround(bets_df, racecard)
+        for race, race_bets in ledger_df.groupby("race_num", sort=True):
+            book = overround.get(race)
+            book_note = f" <span style='font-size: 0.8rem; color: #555555;'>book {book:.0f}%</span>" if pd.notna(book) else ""
+            st.markdown(f"#### Race {int(race)}{book_note}", unsafe_allow_html=True)
 
             for idx, bet in race_bets.iterrows():
-                result_color = {
-                    "PENDING": "#cc9900",
-                    "WIN": "#00802b",
-                    "LOSS": "#cc0000"
-                }.get(bet["result"], "#000000")
+                result_color = BET_RESULT_COLORS.get(bet["result"], "#000000")
 
                 result_text = bet["result"]
-                if bet["result"] == "WIN":
-                    result_text = f"WIN (+EUR {bet['payout']})"
+                if bet["result"] in BET_PAYING_RESULTS:
+                    result_text = f"{bet['result']} (+EUR {bet['payout']})"
 
                 st.markdown(f"""
                 <div class="card" style="border-left: 4px solid {result_color};">
@@ -997,22 +3214,284 @@ def render_leopardstown_ledger(user_id: str):
 
             st.markdown("")
 
+# =============================================================================
+# PUB REGISTRY
+# =============================================================================
+
+PUB_MATCH_CUTOFF = 0.85
+PUB_SUGGESTION_LIMIT = 6
+
+def normalize_pub_name(name) -> str:
+    """Lookup key for a pub name: case, accents, punctuation and a leading 'The' ignored."""
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode().lower()
+    text = re.sub(r"['\u2019]", "", text).replace("&", " and ")
+    words = re.sub(r"[^a-z0-9]+", " ", text).split()
+    if len(words) > 1 and words[0] == "the":
+        words = words[1:]
+    return " ".join(words)
+
+class PubRegistry:
+    """Canonical pub names with a prefix index for autocomplete.
+
+    Every spelling of a pub shares one normalized key; the display name is the
+    most common spelling seen for that key. The prefix index holds each word
+    suffix of every key ("temple bar", "bar") in sorted order, so a prefix
+    lookup is a binary search.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows_seen = 0
+        self._spellings = {}
+        self._canonical = {}
+        self._prefix_index = []
+
+    def _add(self, raw_name: str):
+        key = normalize_pub_name(raw_name)
+        if not key:
+            return
+        spellings = self._spellings.setdefault(key, Counter())
+        spellings[raw_name.strip()] += 1
+        if key not in self._canonical:
+            words = key.split()
+            for i in range(len(words)):
+                bisect.insort(self._prefix_index, (" ".join(words[i:]), key))
+        self._canonical[key] = spellings.most_common(1)[0][0]
+
+    def sync(self, pubs: pd.Series):
+        """Register pub names from Ratings rows added since the last sync."""
+        with self._lock:
+            if len(pubs) < self._rows_seen:
+                # Sheet was cleared or rewritten - start again
+                self.__init__()
+            for raw_name in pubs.iloc[self._rows_seen:].dropna():
+                self._add(str(raw_name))
+            self._rows_seen = len(pubs)
+
+    def pubs(self) -> list:
+        """All canonical pub names, alphabetically."""
+        with self._lock:
+            return sorted(self._canonical.values(), key=str.lower)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Canonical name for an exact or close match, or None for a new pub."""
+        key = normalize_pub_name(name)
+        with self._lock:
+            if key in self._canonical:
+                return self._canonical[key]
+            close = difflib.get_close_matches(key, self._canonical.keys(), n=1, cutoff=PUB_MATCH_CUTOFF)
+            return self._canonical[close[0]] if close else None
+
+    def suggest(self, query: str, limit: int = PUB_SUGGESTION_LIMIT) -> list:
+        """Autocomplete: pubs with a word starting with the query, then close fuzzy matches."""
+        prefix = normalize_pub_name(query)
+        if not prefix:
+            return []
+        keys = []
+        with self._lock:
+            start = bisect.bisect_left(self._prefix_index, (prefix, ""))
+            for suffix, key in self._prefix_index[start:]:
+                if not suffix.startswith(prefix) or len(keys) >= limit:
+                    break
+                if key not in keys:
+                    keys.append(key)
+            if len(keys) < limit:
+                for key in difflib.get_close_matches(prefix, self._canonical.keys(), n=limit, cutoff=0.6):
+                    if key not in keys and len(keys) < limit:
+                        keys.append(key)
+            return [self._canonical[key] for key in keys]
+
+    def canonicalize(self, pubs: pd.Series) -> pd.Series:
+        """Map raw pub names to their canonical names."""
+        with self._lock:
+            mapping = {
+                raw: self._canonical.get(normalize_pub_name(raw), raw)
+                for raw in pubs.dropna().unique()
+            }
+        return pubs.map(mapping)
+
+@st.cache_resource
+def get_pub_registry(trip_id: str) -> PubRegistry:
+    """A trip's pub registry, kept in sync with its Ratings sheet."""
+    return PubRegistry()
+
+# =============================================================================
+# DRINK ANALYTICS
+# =============================================================================
+
+# Nights out run past midnight - a "trip day" starts at 6am
+DAY_ROLLOVER_HOUR = 6
+PACE_WINDOW = timedelta(minutes=60)
+
+def trip_day(ts: datetime) -> str:
+    """Trip day (YYYY-MM-DD) a timestamp belongs to, rolling over at DAY_ROLLOVER_HOUR."""
+    return (ts - timedelta(hours=DAY_ROLLOVER_HOUR)).strftime("%Y-%m-%d")
+
+def trip_day_bounds(day: str) -> tuple:
+    """(start, end) of a trip day (YYYY-MM-DD), for Timeline.rows_between."""
+    start = datetime.strptime(day, "%Y-%m-%d") + timedelta(hours=DAY_ROLLOVER_HOUR)
+    return start, start + timedelta(days=1)
+
+class DrinkAnalytics:
+    """Rolling drink stats, updated only from Ratings rows appended since the last sync.
+
+    Keeps per (trip day, person) counts and first-drink times, per (trip day,
+    pub) counts, and each person's drink times within the pace window, so
+    serving a stat never rescans the drink history.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows_seen = 0
+        self._undated = 0
+        self._day_counts = {}
+        self._day_first = {}
+        self._day_pubs = {}
+        self._recent = {}
+
+    def sync(self, ratings_df: pd.DataFrame, pubs: pd.Series):
+        """Fold in new Ratings rows (pubs: their canonical pub names)."""
+        with self._lock:
+            if len(ratings_df) < self._rows_seen:
+                # Sheet was cleared or rewritten - start again
+                self.__init__()
+            start = self._rows_seen
+            new_rows = ratings_df.iloc[start:]
+            self._rows_seen = len(ratings_df)
+            if new_rows.empty or "timestamp" not in new_rows.columns:
+                return
+
+            timestamps = pd.to_datetime(new_rows["timestamp"], errors="coerce", format="ISO8601")
+            window_start = datetime.now() - PACE_WINDOW
+            for user, pub, ts in zip(new_rows["user_id"], pubs.iloc[start:], timestamps):
+                if pd.isna(ts):
+                    self._undated += 1
+                    continue
+                ts = ts.to_pydatetime()
+                day = trip_day(ts)
+                self._day_counts[(day, user)] = self._day_counts.get((day, user), 0) + 1
+                first = self._day_first.get((day, user))
+                if first is None or ts < first:
+                    self._day_first[(day, user)] = ts
+                if pd.notna(pub):
+                    self._day_pubs.setdefault(day, Counter())[pub] += 1
+                if ts >= window_start:
+                    bisect.insort(self._recent.setdefault(user, []), ts)
+
+    def pace(self, user: str, now: datetime) -> int:
+        """Drinks in the last PACE_WINDOW."""
+        with self._lock:
+            recent = self._recent.get(user, [])
+            # Drop drinks that have slid out of the window
+            del recent[:bisect.bisect_left(recent, now - PACE_WINDOW)]
+            return len(recent)
+
+    def drinks_per_hour(self, user: str, now: datetime) -> float:
+        """Drinks per hour since the person's first drink of the current trip day."""
+        day = trip_day(now)
+        with self._lock:
+            count = self._day_counts.get((day, user), 0)
+            first = self._day_first.get((day, user))
+        if not count:
+            return 0.0
+        hours = max((now - first).total_seconds() / 3600, 1.0)
+        return count / hours
+
+    def busiest_pub(self, now: datetime) -> Optional[tuple]:
+        """(pub, drinks) with the most drinks logged this trip day."""
+        with self._lock:
+            pubs = self._day_pubs.get(trip_day(now))
+            return pubs.most_common(1)[0] if pubs else None
+
+    def undated(self) -> int:
+        """Drinks left out of every stat because their timestamp couldn't be read."""
+        with self._lock:
+            return self._undated
+
+    def drinkers_today(self, now: datetime) -> list:
+        """People with at least one drink this trip day."""
+        day = trip_day(now)
+        with self._lock:
+            return sorted(user for (d, user) in self._day_counts if d == day)
+
+@st.cache_resource
+def get_drink_analytics(trip_id: str) -> DrinkAnalytics:
+    """A trip's rolling drink stats, kept in sync with its Ratings sheet."""
+    return DrinkAnalytics()
+
+def render_drink_stats(user_id: str, ratings_df: pd.DataFrame, pubs: pd.Series):
+    """Render tonight's live drinking stats."""
+    analytics = get_drink_analytics(get_trip_id())
+    committed = committed_rows(ratings_df)
+    analytics.sync(committed, pubs.loc[committed.index])
+    now = datetime.now()
+
+    drinkers = analytics.drinkers_today(now)
+    if not drinkers:
+        return
+
+    st.markdown("### TONIGHT")
+    busiest = analytics.busiest_pub(now)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Your last hour", analytics.pace(user_id, now))
+    with col2:
+        st.metric("Your drinks/hr", f"{analytics.drinks_per_hour(user_id, now):.1f}")
+    if busiest:
+        st.markdown(f"**Busiest pub tonight:** {busiest[0]} ({busiest[1]} drinks)")
+
+    pace_lines = [
+        f"<strong>{person}:</strong> {analytics.pace(person, now)} in the last hour"
+        f" | {analytics.drinks_per_hour(person, now):.1f}/hr"
+        for person in drinkers
+    ]
+    st.markdown(f"""
+    <div class="card" style="font-size: 0.85rem;">{"<br>".join(pace_lines)}</div>
+    """, unsafe_allow_html=True)
+    if undated := analytics.undated():
+        st.caption(f"{undated} drink{'s' if undated != 1 else ''} with an unreadable time not counted")
+    st.markdown("---")
+
 # =============================================================================
 # FEATURE: PINT CRITIC
 # =============================================================================
 
+DRINK_TYPES = ["Guinness", "Jameson", "Other"]
+DRINK_ICONS = {"Guinness": "🍺", "Jameson": "🥃", "Other": "🥤"}
+
+def build_drink_tally(ratings_df: pd.DataFrame) -> tuple:
+    """Count drinks per pub, person and drink type in a single crosstab pass.
+
+    Returns (tally, pub_totals): tally is indexed by (pub, user_id) with one
+    column per drink type; pub_totals is drinks per pub, busiest first.
+    """
+    if "drink_type" in ratings_df.columns:
+        drinks = ratings_df["drink_type"]
+    else:
+        drinks = pd.Series(index=ratings_df.index, dtype=object)
+    # Legacy rows without a drink type were Guinness ratings
+    drinks = drinks.fillna("Guinness")
+    drinks = drinks.where(drinks.isin(DRINK_TYPES), "Other").rename("drink_type")
+
+    tally = pd.crosstab([ratings_df["pub"], ratings_df["user_id"]], drinks)
+    tally = tally.reindex(columns=DRINK_TYPES, fill_value=0)
+    pub_totals = tally.sum(axis=1).groupby(level="pub").sum().sort_values(ascending=False, kind="stable")
+    return tally, pub_totals
+
 def render_pint_critic(user_id: str):
     """Render the drink tracking system."""
     st.markdown("## DRINK TRACKER")
     st.markdown("*Log your drinks at each pub*")
     st.markdown("---")
 
-    ratings_df = load_sheet_data("Ratings")
+    ratings_df = load_trip_sheet("Ratings")
 
-    # Get list of existing pubs
+    # Get list of existing pubs (one canonical entry per venue)
+    pub_registry = get_pub_registry(get_trip_id())
     existing_pubs = []
     if not ratings_df.empty and "pub" in ratings_df.columns:
-        existing_pubs = sorted(ratings_df["pub"].unique().tolist())
+        pub_registry.sync(committed_rows(ratings_df)["pub"])
+        existing_pubs = pub_registry.pubs()
 
     # Quick add section - show existing pubs as buttons
     if existing_pubs:
@@ -1023,9 +3502,15 @@ def render_pint_critic(user_id: str):
         if "selected_pub" not in st.session_state:
             st.session_state.selected_pub = None
 
+        # Autocomplete - narrow the grid down as you type
+        pub_query = st.text_input("Find a pub:", placeholder="Start typing...", key="pub_search")
+        shown_pubs = pub_registry.suggest(pub_query) if pub_query.strip() else existing_pubs
+        if pub_query.strip() and not shown_pubs:
+            st.caption("No matching pub - add it below.")
+
         # Display pub buttons in a grid
         cols = st.columns(2)
-        for i, pub in enumerate(existing_pubs):
+        for i, pub in enumerate(shown_pubs):
             with cols[i % 2]:
                 if st.button(f"📍 {pub}", key=f"pub_{pub}", use_container_width=True):
                     st.session_state.selected_pub = pub
@@ -1035,36 +3520,36 @@ def render_pint_critic(user_id: str):
             st.markdown(f"**Adding drink at: {st.session_state.selected_pub}**")
             drink_cols = st.columns(3)
             with drink_cols[0]:
-                if st.button("🍺 Guinness", key="quick_guinness", use_container_width=True):
+                if idem_key := submission_key("quick_guinness", st.button("🍺 Guinness", key="quick_guinness", use_container_width=True)):
                     drink_data = {
                         "user_id": user_id,
                         "pub": st.session_state.selected_pub,
                         "drink_type": "Guinness",
                         "timestamp": datetime.now().isoformat()
                     }
-                    if append_to_sheet("Ratings", drink_data):
+                    if append_to_sheet("Ratings", drink_data, idem_key):
                         st.session_state.selected_pub = None
                         st.rerun()
             with drink_cols[1]:
-                if st.button("🥃 Jameson", key="quick_jameson", use_container_width=True):
+                if idem_key := submission_key("quick_jameson", st.button("🥃 Jameson", key="quick_jameson", use_container_width=True)):
                     drink_data = {
                         "user_id": user_id,
                         "pub": st.session_state.selected_pub,
                         "drink_type": "Jameson",
                         "timestamp": datetime.now().isoformat()
                     }
-                    if append_to_sheet("Ratings", drink_data):
+                    if append_to_sheet("Ratings", drink_data, idem_key):
                         st.session_state.selected_pub = None
                         st.rerun()
             with drink_cols[2]:
-                if st.button("🥤 Other", key="quick_other", use_container_width=True):
+                if idem_key := submission_key("quick_other", st.button("🥤 Other", key="quick_other", use_container_width=True)):
                     drink_data = {
                         "user_id": user_id,
                         "pub": st.session_state.selected_pub,
                         "drink_type": "Other",
                         "timestamp": datetime.now().isoformat()
                     }
-                    if append_to_sheet("Ratings", drink_data):
+                    if append_to_sheet("Ratings", drink_data, idem_key):
                         st.session_state.selected_pub = None
                         st.rerun()
 
@@ -1080,73 +3565,55 @@ def render_pint_critic(user_id: str):
             pub_name = st.text_input("Pub Name:", placeholder="e.g., The Temple Bar")
             drink_type = st.radio("Drink Type:", ["🍺 Guinness", "🥃 Jameson", "🥤 Other"], horizontal=True)
 
-            if st.form_submit_button("ADD DRINK", use_container_width=True):
-                if pub_name:
+            if idem_key := submission_key("add_drink", st.form_submit_button("ADD DRINK", use_container_width=True)):
+                if pub_name and pub_name.strip():
                     # Clean up drink type (remove emoji)
                     clean_drink = drink_type.split(" ", 1)[1] if " " in drink_type else drink_type
+                    # Reuse the existing entry if this pub is already known under another spelling
+                    canonical_pub = pub_registry.resolve(pub_name) or " ".join(pub_name.split())
                     drink_data = {
                         "user_id": user_id,
-                        "pub": pub_name.strip(),
+                        "pub": canonical_pub,
                         "drink_type": clean_drink,
                         "timestamp": datetime.now().isoformat()
                     }
-                    if append_to_sheet("Ratings", drink_data):
-                        st.success(f"Drink added at {pub_name}!")
+                    if append_to_sheet("Ratings", drink_data, idem_key):
+                        st.success(f"Drink added at {canonical_pub}!")
                         st.rerun()
                 else:
                     st.error("Please enter the pub name.")
 
+    if not ratings_df.empty:
+        canonical_pubs = pub_registry.canonicalize(ratings_df["pub"])
+        render_drink_stats(user_id, ratings_df, canonical_pubs)
+
     # Display drink counts by pub
     st.markdown("### DRINK TALLY")
 
     if ratings_df.empty:
         st.info("No drinks logged yet. Time to find a pub!")
     else:
-        # Group by pub and count drinks
-        pub_counts = ratings_df.groupby("pub").size().sort_values(ascending=False)
-
-        for pub in pub_counts.index:
-            pub_drinks = ratings_df[ratings_df["pub"] == pub]
-            total = len(pub_drinks)
-
-            # Count by drink type
-            guinness_count = len(pub_drinks[pub_drinks.get("drink_type", pd.Series()) == "Guinness"]) if "drink_type" in pub_drinks.columns else 0
-            jameson_count = len(pub_drinks[pub_drinks.get("drink_type", pd.Series()) == "Jameson"]) if "drink_type" in pub_drinks.columns else 0
-            other_count = len(pub_drinks[pub_drinks.get("drink_type", pd.Series()) == "Other"]) if "drink_type" in pub_drinks.columns else 0
-
-            # For legacy data without drink_type, count as Guinness
-            if "drink_type" not in pub_drinks.columns or pub_drinks["drink_type"].isna().all():
-                guinness_count = total
-
-            drink_breakdown = []
-            if guinness_count > 0:
-                drink_breakdown.append(f"🍺 {guinness_count}")
-            if jameson_count > 0:
-                drink_breakdown.append(f"🥃 {jameson_count}")
-            if other_count > 0:
-                drink_breakdown.append(f"🥤 {other_count}")
-
-            breakdown_str = " | ".join(drink_breakdown) if drink_breakdown else f"🍺 {total}"
+        # Whole trip, or one trip day sliced off the timeline
+        timeline = timeline_of(ratings_df)
+        tally_day = st.selectbox("Show:", ["Whole trip"] + timeline.days()[::-1], key="tally_day")
+        tally_df = ratings_df if tally_day == "Whole trip" else timeline.rows_between(*trip_day_bounds(tally_day))
+        tally, pub_totals = build_drink_tally(tally_df.assign(pub=canonical_pubs.loc[tally_df.index]))
+        pub_tallies = {pub: pub_tally.droplevel("pub") for pub, pub_tally in tally.groupby(level="pub", sort=False)}
+
+        for pub, total in pub_totals.items():
+            pub_tally = pub_tallies[pub]
+            type_totals = pub_tally.sum()
+
+            drink_breakdown = [
+                f"{DRINK_ICONS[drink]} {int(type_totals[drink])}"
+                for drink in DRINK_TYPES if type_totals[drink] > 0
+            ]
+            breakdown_str = " | ".join(drink_breakdown)
 
             # Build per-person breakdown
             person_breakdown = []
-            for person in pub_drinks["user_id"].unique():
-                person_drinks = pub_drinks[pub_drinks["user_id"] == person]
-                p_guinness = len(person_drinks[person_drinks.get("drink_type", pd.Series()) == "Guinness"]) if "drink_type" in person_drinks.columns else 0
-                p_jameson = len(person_drinks[person_drinks.get("drink_type", pd.Series()) == "Jameson"]) if "drink_type" in person_drinks.columns else 0
-                p_other = len(person_drinks[person_drinks.get("drink_type", pd.Series()) == "Other"]) if "drink_type" in person_drinks.columns else 0
-                # Handle legacy data
-                if "drink_type" not in person_drinks.columns or person_drinks["drink_type"].isna().all():
-                    p_guinness = len(person_drinks)
-
-                drinks_icons = ""
-                if p_guinness > 0:
-                    drinks_icons += "🍺" * p_guinness
-                if p_jameson > 0:
-                    drinks_icons += "🥃" * p_jameson
-                if p_other > 0:
-                    drinks_icons += "🥤" * p_other
-
+            for person, counts in zip(pub_tally.index, pub_tally[DRINK_TYPES].itertuples(index=False)):
+                drinks_icons = "".join(DRINK_ICONS[drink] * int(n) for drink, n in zip(DRINK_TYPES, counts))
                 if drinks_icons:
                     person_breakdown.append(f"<strong>{person}:</strong> {drinks_icons}")
 
@@ -1162,6 +3629,116 @@ def render_pint_critic(user_id: str):
             </div>
             """, unsafe_allow_html=True)
 
+# =============================================================================
+# VOTES & LIKES
+# =============================================================================
+
+QUOTE_VOTES_SHEET = "QuoteVotes"
+PHOTO_LIKES_SHEET = "PhotoLikes"
+
+class VoteIndex:
+    """Set of (target, user) votes with a precomputed count per target.
+
+    Votes live in an append-only sheet of (target, user, timestamp) rows, so
+    only rows added since the last sync are read. Votes recorded the old way,
+    as a comma-joined user string on the target's own row, are merged in once
+    per target row. A repeat vote for the same target is ignored.
+    """
+
+    def __init__(self, target_col: str, user_col: str, legacy_target_col: str, legacy_users_col: str):
+        self._lock = threading.Lock()
+        self.target_col = target_col
+        self.user_col = user_col
+        self._legacy_cols = (legacy_target_col, legacy_users_col)
+        self._reset()
+
+    def _reset(self):
+        self._rows_seen = 0
+        self._legacy_rows_seen = 0
+        self._pairs = set()
+        self._counts = Counter()
+
+    def _add(self, target: str, user: str):
+        if not target or not user or (target, user) in self._pairs:
+            return
+        self._pairs.add((target, user))
+        self._counts[target] += 1
+
+    def sync(self, votes_df: pd.DataFrame, legacy_df: pd.DataFrame):
+        """Index vote rows and legacy target rows added since the last sync."""
+        target_col, user_col = self.target_col, self.user_col
+        legacy_target_col, legacy_users_col = self._legacy_cols
+        with self._lock:
+            if len(votes_df) < self._rows_seen or len(legacy_df) < self._legacy_rows_seen:
+                # A sheet was cleared or rewritten - start again
+                self._reset()
+            if {target_col, user_col} <= set(votes_df.columns):
+                new_votes = votes_df.iloc[self._rows_seen:]
+                for target, user in zip(new_votes[target_col], new_votes[user_col]):
+                    if pd.notna(target) and pd.notna(user):
+                        self._add(str(target), str(user).strip())
+            self._rows_seen = len(votes_df)
+
+            if {legacy_target_col, legacy_users_col} <= set(legacy_df.columns):
+                new_rows = legacy_df.iloc[self._legacy_rows_seen:]
+                for target, users in zip(new_rows[legacy_target_col], new_rows[legacy_users_col]):
+                    if pd.isna(target) or pd.isna(users):
+                        continue
+                    for user in str(users).split(","):
+                        self._add(str(target), user.strip())
+            self._legacy_rows_seen = len(legacy_df)
+
+    def record(self, target: str, user: str):
+        """Count a vote that was just appended, ahead of the next sheet reload."""
+        with self._lock:
+            self._add(str(target), user)
+
+    def has_voted(self, target: str, user: str) -> bool:
+        return (str(target), user) in self._pairs
+
+    def count(self, target: str) -> int:
+        return self._counts.get(str(target), 0)
+
+    def counts(self, targets: pd.Series) -> pd.Series:
+        """Vote count for each target in a column, as an int series."""
+        with self._lock:
+            return targets.astype(str).map(self._counts).fillna(0).astype(int)
+
+@st.cache_resource
+def get_quote_vote_index(trip_id: str):
+    """A trip's quote votes, keyed by the quote's timestamp."""
+    return VoteIndex("quote_id", "voter", "timestamp", "voters")
+
+@st.cache_resource
+def get_photo_like_index(trip_id: str):
+    """A trip's photo likes, keyed by the photo's image URL."""
+    return VoteIndex("photo_id", "liker", "image_url", "likers")
+
+def load_quote_votes(quotes_df: pd.DataFrame) -> VoteIndex:
+    """Quote vote index brought up to date with the latest sheet data."""
+    index = get_quote_vote_index(get_trip_id())
+    index.sync(committed_rows(load_sheet_data(QUOTE_VOTES_SHEET)), committed_rows(quotes_df))
+    return index
+
+def load_photo_likes(photos_df: pd.DataFrame) -> VoteIndex:
+    """Photo like index brought up to date with the latest sheet data."""
+    index = get_photo_like_index(get_trip_id())
+    index.sync(committed_rows(load_sheet_data(PHOTO_LIKES_SHEET)), committed_rows(photos_df))
+    return index
+
+def cast_vote(index: VoteIndex, sheet: str, target: str, user_id: str) -> bool:
+    """Append one vote record; no-op if the user already voted for the target."""
+    if index.has_voted(target, user_id):
+        return True
+    if not append_to_sheet(sheet, {
+        index.target_col: str(target),
+        index.user_col: user_id,
+        "timestamp": datetime.now().isoformat()
+    }):
+        return False
+    index.record(target, user_id)
+    return True
+
 # =============================================================================
 # FEATURE: QUOTE WALL
 # =============================================================================
@@ -1177,14 +3754,14 @@ def render_quote_wall(user_id: str):
     # Submit new quote
     with st.expander("ADD A QUOTE", expanded=False):
         with st.form("new_quote"):
-            speaker = st.selectbox("Who said it:", options=USERS)
+            speaker = st.selectbox("Who said it:", options=get_roster())
             quote_text = st.text_area(
                 "The quote:",
                 placeholder="e.g., 'I'll just have one more...'",
                 max_chars=300
             )
 
-            if st.form_submit_button("SUBMIT QUOTE", use_container_width=True):
+            if idem_key := submission_key("submit_quote", st.form_submit_button("SUBMIT QUOTE", use_container_width=True)):
                 if quote_text and len(quote_text.strip()) > 5:
                     quote_data = {
                         "submitter": user_id,
@@ -1194,21 +3771,25 @@ def render_quote_wall(user_id: str):
                         "votes": 0,
                         "voters": ""
                     }
-                    if append_to_sheet("Quotes", quote_data):
+                    if append_to_sheet("Quotes", quote_data, idem_key):
                         st.success("Quote added!")
                         st.rerun()
                 else:
                     st.error("Please enter a proper quote (at least 5 characters).")
 
+    vote_index = load_quote_votes(quotes_df)
+    if not quotes_df.empty:
+        quotes_df = quotes_df.assign(vote_count=vote_index.counts(quotes_df["timestamp"]))
+
     # Show Quote of the Trip (most votes)
-    if not quotes_df.empty and quotes_df["votes"].max() > 0:
-        top_quote = quotes_df.loc[quotes_df["votes"].idxmax()]
+    if not quotes_df.empty and quotes_df["vote_count"].max() > 0:
+        top_quote = quotes_df.loc[quotes_df["vote_count"].idxmax()]
         st.markdown("### QUOTE OF THE TRIP")
         st.markdown(f"""
         <div class="card" style="border-left: 8px solid #ffd700; background: linear-gradient(90deg, rgba(255,215,0,0.15) 0%, #ffffff 30%);">
             <span style="font-size: 1.5rem;">"{top_quote['quote']}"</span><br>
             <span style="color: #555555;">— {top_quote['speaker']}</span><br>
-            <span style="color: #FF6B00; font-weight: bold;">👍 {int(top_quote['votes'])} votes</span>
+            <span style="color: #FF6B00; font-weight: bold;">👍 {int(top_quote['vote_count'])} votes</span>
         </div>
         """, unsafe_allow_html=True)
         st.markdown("---")
@@ -1220,19 +3801,18 @@ def render_quote_wall(user_id: str):
         st.info("No quotes yet. Someone say something memorable!")
     else:
         # Sort by votes (descending), then by timestamp (newest first)
-        quotes_df = quotes_df.sort_values(["votes", "timestamp"], ascending=[False, False])
+        quotes_df = quotes_df.sort_values(["vote_count", "timestamp"], ascending=[False, False])
 
         for idx, quote in quotes_df.iterrows():
-            voters_list = str(quote.get("voters", "")).split(",") if quote.get("voters") else []
-            voters_list = [v for v in voters_list if v]  # Remove empty strings
-            user_voted = user_id in voters_list
-            vote_count = int(quote["votes"]) if pd.notna(quote["votes"]) else 0
+            quote_id = str(quote["timestamp"])
+            user_voted = vote_index.has_voted(quote_id, user_id)
+            vote_count = int(quote["vote_count"])
 
             st.markdown(f"""
             <div class="card">
                 <span style="font-size: 1.2rem;">"{quote['quote']}"</span><br>
                 <span style="color: #555555;">— {quote['speaker']}</span>
-                <span style="color: #888888; font-size: 0.8rem;">(submitted by {quote['submitter']})</span><br>
+                <span style="color: #888888; font-size: 0.8rem;">(submitted by {quote['submitter']})</span>{pending_badge(quote)}<br>
                 <span style="color: #FF6B00; font-weight: bold;">👍 {vote_count}</span>
             </div>
             """, unsafe_allow_html=True)
@@ -1240,10 +3820,8 @@ def render_quote_wall(user_id: str):
             # Vote button
             if not user_voted:
                 if st.button(f"👍 Vote", key=f"vote_quote_{idx}", use_container_width=True):
-                    quotes_df.loc[idx, "votes"] = vote_count + 1
-                    quotes_df.loc[idx, "voters"] = ",".join(voters_list + [user_id])
-                    update_sheet("Quotes", quotes_df)
-                    st.rerun()
+                    if cast_vote(vote_index, QUOTE_VOTES_SHEET, quote_id, user_id):
+                        st.rerun()
             else:
                 st.caption("You voted for this quote.")
 
@@ -1254,6 +3832,100 @@ def render_quote_wall(user_id: str):
 # FEATURE: SIDE BETS
 # =============================================================================
 
+SETTLE_UP_EXACT_LIMIT = 12  # exact search over subsets up to this many people
+
+def side_bet_key(bet) -> dict:
+    """Columns identifying a SideBets row."""
+    return {"creator": bet["creator"], "timestamp": bet["timestamp"]}
+
+def settled_side_bets(sidebets_df: pd.DataFrame) -> pd.DataFrame:
+    """Settled side bets with winner, loser and integer stake columns."""
+    if sidebets_df.empty or "result" not in sidebets_df.columns:
+        return pd.DataFrame(columns=["creator", "taker", "description", "winner", "loser", "stake"])
+    settled = sidebets_df[sidebets_df["result"].isin(["WIN", "LOSS"])]
+    creator_won = settled["result"] == "WIN"
+    return settled.assign(
+        winner=np.where(creator_won, settled["creator"], settled["taker"]),
+        loser=np.where(creator_won, settled["taker"], settled["creator"]),
+        stake=pd.to_numeric(settled["stake"], errors="coerce").fillna(0).astype(int)
+    )
+
+def side_bet_balances(settled: pd.DataFrame) -> pd.DataFrame:
+    """Pairwise net balances: cell [a, b] is what b owes a (negative if a owes b)."""
+    if settled.empty:
+        return pd.DataFrame(dtype=int)
+    won = settled.pivot_table(index="winner", columns="loser", values="stake", aggfunc="sum", fill_value=0)
+    people = sorted(set(won.index) | set(won.columns))
+    won = won.reindex(index=people, columns=people, fill_value=0).rename_axis(index=None, columns=None)
+    return (won - won.T).astype(int)
+
+def _settle_group(balances: list) -> list:
+    """Greedy transfers for (person, balance) pairs summing to zero."""
+    creditors = sorted(((b, p) for p, b in balances if b > 0), reverse=True)
+    debtors = sorted(((-b, p) for p, b in balances if b < 0), reverse=True)
+    transfers = []
+    i = j = 0
+    while i < len(creditors) and j < len(debtors):
+        credit, payee = creditors[i]
+        debt, payer = debtors[j]
+        amount = min(credit, debt)
+        transfers.append((payer, payee, amount))
+        creditors[i] = (credit - amount, payee)
+        debtors[j] = (debt - amount, payer)
+        if creditors[i][0] == 0:
+            i += 1
+        if debtors[j][0] == 0:
+            j += 1
+    return transfers
+
+def settle_up_plan(net: pd.Series) -> list:
+    """Fewest (payer, payee, amount) transfers that clear every net balance.
+
+    The fewest transfers is the number of people minus the most groups whose
+    balances sum to zero on their own, since each such group clears in one
+    fewer transfer than its size. Up to SETTLE_UP_EXACT_LIMIT people that
+    partition is found exactly with a DP over subsets; beyond it, everyone
+    is settled greedily as one group.
+    """
+    balances = [(person, int(balance)) for person, balance in net.items() if balance != 0]
+    n = len(balances)
+    if n == 0:
+        return []
+    if n > SETTLE_UP_EXACT_LIMIT:
+        return _settle_group(balances)
+
+    full = (1 << n) - 1
+    sums = [0] * (full + 1)
+    for mask in range(1, full + 1):
+        low = (mask & -mask).bit_length() - 1
+        sums[mask] = sums[mask & (mask - 1)] + balances[low][1]
+    # groups[mask]: most zero-sum groups when the people in mask are added one at a time
+    groups = [0] * (full + 1)
+    for mask in range(1, full + 1):
+        best = max(groups[mask ^ (1 << i)] for i in range(n) if mask >> i & 1)
+        groups[mask] = best + (sums[mask] == 0)
+
+    # Walk back to recover an order whose zero prefix sums mark the groups
+    order = []
+    mask = full
+    while mask:
+        for i in range(n):
+            if mask >> i & 1 and groups[mask ^ (1 << i)] + (sums[mask] == 0) == groups[mask]:
+                order.append(i)
+                mask ^= 1 << i
+                break
+    order.reverse()
+
+    transfers = []
+    group, running = [], 0
+    for i in order:
+        group.append(balances[i])
+        running += balances[i][1]
+        if running == 0:
+            transfers.extend(_settle_group(group))
+            group = []
+    return transfers
+
 def render_side_bets(user_id: str):
     """Render side bets - prop bets between friends."""
     st.markdown("## SIDE BETS")
@@ -1266,7 +3938,7 @@ def render_side_bets(user_id: str):
     with st.expander("CREATE A BET", expanded=False):
         with st.form("new_sidebet"):
             # Select opponent
-            opponents = [u for u in USERS if u != user_id]
+            opponents = [u for u in get_roster() if u != user_id]
             opponent = st.selectbox("Bet against:", options=opponents)
 
             description = st.text_area(
@@ -1276,7 +3948,7 @@ def render_side_bets(user_id: str):
             )
             stake = st.number_input("Points at Stake:", min_value=5, max_value=100, value=10, step=5)
 
-            if st.form_submit_button("CREATE BET", use_container_width=True):
+            if idem_key := submission_key("create_side_bet", st.form_submit_button("CREATE BET", use_container_width=True)):
                 if description and len(description.strip()) > 10:
                     bet_data = {
                         "creator": user_id,
@@ -1287,7 +3959,7 @@ def render_side_bets(user_id: str):
                         "result": "OPEN",
                         "settled_by": ""
                     }
-                    if append_to_sheet("SideBets", bet_data):
+                    if append_to_sheet("SideBets", bet_data, idem_key):
                         st.success(f"Bet created with {opponent}!")
                         st.rerun()
                 else:
@@ -1325,16 +3997,12 @@ def render_side_bets(user_id: str):
                     col1, col2 = st.columns(2)
                     with col1:
                         if st.button(f"{creator} WON", key=f"creator_won_{idx}", use_container_width=True):
-                            sidebets_df.loc[idx, "result"] = "WIN"
-                            sidebets_df.loc[idx, "settled_by"] = user_id
-                            update_sheet("SideBets", sidebets_df)
-                            st.rerun()
+                            if commit_ops("SideBets", [op_update_where(side_bet_key(bet), {"result": "WIN", "settled_by": user_id})]):
+                                st.rerun()
                     with col2:
                         if st.button(f"{taker} WON", key=f"taker_won_{idx}", use_container_width=True):
-                            sidebets_df.loc[idx, "result"] = "LOSS"
-                            sidebets_df.loc[idx, "settled_by"] = user_id
-                            update_sheet("SideBets", sidebets_df)
-                            st.rerun()
+                            if commit_ops("SideBets", [op_update_where(side_bet_key(bet), {"result": "LOSS", "settled_by": user_id})]):
+                                st.rerun()
 
                     # Delete option with confirmation
                     delete_key = f"delete_confirm_{idx}"
@@ -1350,10 +4018,9 @@ def render_side_bets(user_id: str):
                         col1, col2 = st.columns(2)
                         with col1:
                             if st.button("YES, DELETE", key=f"confirm_delete_{idx}", use_container_width=True):
-                                sidebets_df = sidebets_df.drop(idx)
-                                update_sheet("SideBets", sidebets_df)
-                                st.session_state[delete_key] = False
-                                st.rerun()
+                                if commit_ops("SideBets", [op_delete_where(side_bet_key(bet))]):
+                                    st.session_state[delete_key] = False
+                                    st.rerun()
                         with col2:
                             if st.button("CANCEL", key=f"cancel_delete_{idx}", use_container_width=True):
                                 st.session_state[delete_key] = False
@@ -1365,144 +4032,202 @@ def render_side_bets(user_id: str):
     st.markdown("---")
     st.markdown("### SETTLED BETS")
 
-    if not sidebets_df.empty:
-        settled_bets = sidebets_df[sidebets_df["result"].isin(["WIN", "LOSS"])]
+    settled_bets = settled_side_bets(sidebets_df)
 
-        if settled_bets.empty:
-            st.info("No settled bets yet.")
-        else:
-            for idx, bet in settled_bets.iterrows():
-                result = bet["result"]
-                creator = bet["creator"]
-                taker = bet["taker"]
-                stake = int(bet["stake"])
+    if settled_bets.empty:
+        st.info("No settled bets yet.")
+    else:
+        for bet in settled_bets.itertuples():
+            st.markdown(f"""
+            <div class="card" style="border-left: 4px solid #00994d;">
+                <span style="font-size: 1rem;">"{bet.description}"</span><br>
+                <span style="color: #00994d; font-weight: bold;">🏆 {bet.winner} wins {bet.stake} pts from {bet.loser}</span>
+            </div>
+            """, unsafe_allow_html=True)
 
-                # Determine winner/loser
-                if result == "WIN":
-                    winner = creator
-                    loser = taker
-                else:
-                    winner = taker
-                    loser = creator
+        # Settle up
+        st.markdown("---")
+        st.markdown("### SETTLE UP")
+        st.markdown("*Fewest handovers to square every side bet*")
 
-                result_color = "#00994d"
+        balances = side_bet_balances(settled_bets)
+        plan = settle_up_plan(balances.sum(axis=1))
 
+        if not plan:
+            st.info("All square - nobody owes anybody.")
+        else:
+            for payer, payee, amount in plan:
                 st.markdown(f"""
-                <div class="card" style="border-left: 4px solid {result_color};">
-                    <span style="font-size: 1rem;">"{bet['description']}"</span><br>
-                    <span style="color: #00994d; font-weight: bold;">🏆 {winner} wins {stake} pts from {loser}</span>
+                <div class="card" style="border-left: 4px solid #FF6B00;">
+                    <strong>{payer}</strong> pays <strong>{payee}</strong>
+                    <span style="color: #FF6B00; font-weight: bold; float: right;">{amount} pts</span>
                 </div>
                 """, unsafe_allow_html=True)
 
+        with st.expander("WHO OWES WHOM", expanded=False):
+            st.caption("Each cell is what the column owes the row, net of bets both ways.")
+            st.dataframe(balances, use_container_width=True)
 
 # =============================================================================
 # FEATURE: DAILY MVP
 # =============================================================================
 
+class MVPIndex:
+    """Each voter's ballot per day, with a running nominee tally for each day.
+
+    A sync compares the sheet's nominee column with the one it last saw and
+    moves votes only for the rows that changed or were added, and an upsert
+    made here adjusts the tallies straight away. If a voter has more than one
+    row for a day, the last one is their ballot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._labels = pd.Index([])
+        self._nominees = np.array([], dtype=object)
+        self._ballots = {}
+        self._day_counts = {}
+
+    def _set(self, voter: str, day: str, label, nominee: str):
+        old = self._ballots.get((voter, day))
+        if old is not None:
+            if label is not None and old[0] is not None and label < old[0]:
+                return  # an earlier row, superseded by the ballot
+            counts = self._day_counts[day]
+            counts[old[1]] -= 1
+            if not counts[old[1]]:
+                del counts[old[1]]
+        self._ballots[(voter, day)] = (label, nominee)
+        self._day_counts.setdefault(day, Counter())[nominee] += 1
+
+    def sync(self, mvp_df: pd.DataFrame):
+        """Fold in MVPVotes rows added or changed since the last sync."""
+        if mvp_df.attrs.get("stale") or not {"voter", "day", "nominee"} <= set(mvp_df.columns):
+            return
+        with self._lock:
+            seen = len(self._labels)
+            if len(mvp_df) < seen or not mvp_df.index[:seen].equals(self._labels):
+                # Rows were deleted or the sheet rewritten - start again
+                self._reset()
+                seen = 0
+            nominees = mvp_df["nominee"].to_numpy(dtype=object)
+            changed = np.flatnonzero(nominees[:seen] != self._nominees).tolist() + list(range(seen, len(mvp_df)))
+            voters, days = mvp_df["voter"].to_numpy(dtype=object), mvp_df["day"].to_numpy(dtype=object)
+            for position in changed:
+                if pd.notna(voters[position]) and pd.notna(days[position]) and pd.notna(nominees[position]):
+                    self._set(voters[position], days[position], mvp_df.index[position], nominees[position])
+            self._labels = mvp_df.index.copy()
+            self._nominees = nominees
+
+    def record(self, voter: str, day: str, nominee: str, row=None):
+        """Count a ballot that was just upserted, ahead of the next sheet reload."""
+        with self._lock:
+            self._set(voter, day, row, nominee)
+
+    def ballot(self, voter: str, day: str) -> tuple:
+        """(row label, nominee) of a voter's ballot for a day, or (None, None)."""
+        with self._lock:
+            return self._ballots.get((voter, day), (None, None))
+
+    def day_counts(self) -> dict:
+        """Nominee tallies by day."""
+        with self._lock:
+            return {day: Counter(counts) for day, counts in self._day_counts.items() if counts}
+
+@st.cache_resource
+def get_mvp_index(trip_id: str) -> MVPIndex:
+    """A trip's MVP ballots and tallies, shared by all of its sessions."""
+    return MVPIndex()
+
+def mvp_standings(counts: Counter) -> list:
+    """(nominee, votes) pairs, most votes first, ties broken alphabetically."""
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+def upsert_mvp_vote(user_id: str, day: str, nominee: str, row: Optional[int] = None,
+                    idem_key: Optional[str] = None) -> bool:
+    """Record a voter's ballot for a day, replacing their earlier one if any.
+
+    row is the index label of their earlier ballot, from MVPIndex.ballot.
+    """
+    if not commit_ops("MVPVotes", [op_upsert(
+        {"voter": user_id, "day": day},
+        {"nominee": nominee, "timestamp": datetime.now().isoformat()},
+        row
+    )], idem_key=idem_key):
+        return False
+    get_mvp_index(get_trip_id()).record(user_id, day, nominee, row)
+    return True
+
 def render_mvp_vote(user_id: str):
     """Render MVP voting - vote for each day's MVP."""
     st.markdown("## DAILY MVP")
     st.markdown("*Vote for today's Most Valuable Player*")
     st.markdown("---")
 
-    mvp_df = load_sheet_data("MVPVotes")
+    mvp_index = get_mvp_index(get_trip_id())
+    mvp_index.sync(load_sheet_data("MVPVotes"))
+    day_counts = mvp_index.day_counts()
     today = datetime.now().strftime("%Y-%m-%d")
 
     # Current day voting
     st.markdown("### VOTE FOR TODAY'S MVP")
 
     # Check if user already voted today
-    user_voted_today = False
-    current_vote = None
-    if not mvp_df.empty:
-        user_today_votes = mvp_df[(mvp_df["voter"] == user_id) & (mvp_df["day"] == today)]
-        if not user_today_votes.empty:
-            user_voted_today = True
-            current_vote = user_today_votes.iloc[-1]["nominee"]
-
-    if user_voted_today:
+    ballot_row, current_vote = mvp_index.ballot(user_id, today)
+    if current_vote is not None:
         st.info(f"You voted for **{current_vote}** today. You can change your vote below.")
 
     # Vote buttons (grid of user names)
     st.markdown("*Tap a name to vote:*")
-    other_users = [u for u in USERS if u != user_id]
+    other_users = [u for u in get_roster() if u != user_id]
     cols = st.columns(2)
     for i, nominee in enumerate(other_users):
         with cols[i % 2]:
             btn_label = f"⭐ {nominee}" if nominee == current_vote else nominee
-            if st.button(btn_label, key=f"mvp_{nominee}", use_container_width=True):
-                if user_voted_today:
-                    # Update existing vote
-                    for idx, row in mvp_df.iterrows():
-                        if row["voter"] == user_id and row["day"] == today:
-                            mvp_df.loc[idx, "nominee"] = nominee
-                            mvp_df.loc[idx, "timestamp"] = datetime.now().isoformat()
-                    update_sheet("MVPVotes", mvp_df)
-                else:
-                    # New vote
-                    vote_data = {
-                        "voter": user_id,
-                        "nominee": nominee,
-                        "day": today,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    append_to_sheet("MVPVotes", vote_data)
-                st.rerun()
+            if idem_key := submission_key(f"mvp_{nominee}", st.button(btn_label, key=f"mvp_{nominee}", use_container_width=True)):
+                if nominee == current_vote or upsert_mvp_vote(user_id, today, nominee, ballot_row, idem_key):
+                    st.rerun()
 
     # Today's standings
     st.markdown("---")
     st.markdown("### TODAY'S STANDINGS")
 
-    if mvp_df.empty:
+    standings = mvp_standings(day_counts.get(today, Counter()))
+    if not standings:
         st.info("No votes yet today.")
     else:
-        today_votes = mvp_df[mvp_df["day"] == today]
-        if today_votes.empty:
-            st.info("No votes yet today.")
-        else:
-            # Count votes per nominee
-            vote_counts = today_votes.groupby("nominee").size().sort_values(ascending=False)
+        for rank, (nominee, count) in enumerate(standings):
+            is_leader = rank == 0
+            leader_style = "border-left: 8px solid #ffd700; background: linear-gradient(90deg, rgba(255,215,0,0.15) 0%, #ffffff 30%);" if is_leader else ""
 
-            for nominee, count in vote_counts.items():
-                is_leader = nominee == vote_counts.index[0]
-                leader_style = "border-left: 8px solid #ffd700; background: linear-gradient(90deg, rgba(255,215,0,0.15) 0%, #ffffff 30%);" if is_leader else ""
-
-                st.markdown(f"""
-                <div class="card" style="{leader_style}">
-                    <span style="font-weight: bold; font-size: 1.1rem;">{'⭐ ' if is_leader else ''}{nominee}</span>
-                    <span style="color: #FF6B00; font-weight: bold; float: right;">{count} vote{'s' if count != 1 else ''}</span>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(f"""
+            <div class="card" style="{leader_style}">
+                <span style="font-weight: bold; font-size: 1.1rem;">{'⭐ ' if is_leader else ''}{nominee}</span>
+                <span style="color: #FF6B00; font-weight: bold; float: right;">{count} vote{'s' if count != 1 else ''}</span>
+            </div>
+            """, unsafe_allow_html=True)
 
     # Past MVP Winners
     st.markdown("---")
     st.markdown("### PAST MVP WINNERS")
 
-    if not mvp_df.empty:
-        past_days = [d for d in mvp_df["day"].unique() if d != today]
-        past_days = sorted(past_days, reverse=True)
-
-        if not past_days:
-            st.info("No past winners yet.")
-        else:
-            for day in past_days:
-                day_votes = mvp_df[mvp_df["day"] == day]
-                vote_counts = day_votes.groupby("nominee").size().sort_values(ascending=False)
-
-                if not vote_counts.empty:
-                    winner = vote_counts.index[0]
-                    winner_votes = vote_counts.iloc[0]
-
-                    st.markdown(f"""
-                    <div class="card">
-                        <strong>{day}</strong><br>
-                        <span style="color: #FF6B00; font-weight: bold;">🏆 {winner}</span>
-                        <span style="color: #555555;">({winner_votes} votes)</span>
-                    </div>
-                    """, unsafe_allow_html=True)
-    else:
+    past_days = sorted((d for d in day_counts if d != today), reverse=True)
+    if not past_days:
         st.info("No past winners yet.")
+    else:
+        for day in past_days:
+            winner, winner_votes = mvp_standings(day_counts[day])[0]
 
+            st.markdown(f"""
+            <div class="card">
+                <strong>{day}</strong><br>
+                <span style="color: #FF6B00; font-weight: bold;">🏆 {winner}</span>
+                <span style="color: #555555;">({winner_votes} votes)</span>
+            </div>
+            """, unsafe_allow_html=True)
 
 # =============================================================================
 # FEATURE: PHOTO WALL
@@ -1516,47 +4241,62 @@ def render_photo_wall(user_id: str):
 
     photos_df = load_sheet_data("Photos")
 
-    # Check if Cloudinary is configured
-    cloudinary_configured = False
-    try:
-        if st.secrets.get("CLOUDINARY_CLOUD_NAME"):
-            cloudinary_configured = True
-    except:
-        pass
+    # Check if a photo store (Cloudinary or local) is configured
+    blob_store = get_blob_store(get_trip_id())
 
-    if not cloudinary_configured:
+    if blob_store is None:
         st.warning("Photo uploads not configured yet. Ask James to set up Cloudinary!")
     else:
         # Upload new photo
         with st.expander("UPLOAD A PHOTO", expanded=False):
-            uploaded_file = st.file_uploader(
-                "Choose an image",
+            # Bumping the nonce gives a fresh (empty) uploader once a file is queued
+            upload_nonce = st.session_state.get("photo_upload_nonce", 0)
+            uploaded_files = st.file_uploader(
+                "Choose images",
                 type=["jpg", "jpeg", "png", "heic"],
-                key="photo_upload"
+                accept_multiple_files=True,
+                key=f"photo_upload_{upload_nonce}"
             )
 
             caption = st.text_input("Caption (optional):", placeholder="e.g., 'First pint at Temple Bar'")
 
-            if uploaded_file is not None:
+            if uploaded_files:
                 # Show preview
-                st.image(uploaded_file, caption="Preview", use_container_width=True)
-
-                if st.button("UPLOAD PHOTO", use_container_width=True):
-                    with st.spinner("Uploading..."):
-                        image_url = upload_image_to_cloudinary(uploaded_file)
-
-                        if image_url:
-                            photo_data = {
-                                "uploader": user_id,
-                                "caption": caption.strip() if caption else "",
-                                "image_url": image_url,
-                                "timestamp": datetime.now().isoformat(),
-                                "likes": 0,
-                                "likers": ""
-                            }
-                            if append_to_sheet("Photos", photo_data):
-                                st.success("Photo uploaded!")
-                                st.rerun()
+                if len(uploaded_files) == 1:
+                    st.image(uploaded_files[0], caption="Preview", use_container_width=True)
+                else:
+                    st.image(uploaded_files, width=100)
+
+                # Check for near-duplicates before anything goes to the photo store
+                phashes, duplicates = find_duplicate_uploads(uploaded_files, photos_df)
+                for i, match in duplicates.items():
+                    if match.get("uploader"):
+                        st.warning(f"{uploaded_files[i].name} looks like a photo {match['uploader']} already posted.")
+                    else:
+                        st.warning(f"{uploaded_files[i].name} looks like {match['filename']} in this batch.")
+
+                include_duplicates = False
+                if duplicates:
+                    include_duplicates = st.checkbox("Upload duplicates anyway", key=f"photo_dupes_{upload_nonce}")
+
+                to_upload = [
+                    (f, phash) for i, (f, phash) in enumerate(zip(uploaded_files, phashes))
+                    if include_duplicates or i not in duplicates
+                ]
+
+                if to_upload:
+                    label = "UPLOAD PHOTO" if len(to_upload) == 1 else f"UPLOAD {len(to_upload)} PHOTOS"
+                    if st.button(label, use_container_width=True):
+                        submit_photo_uploads(
+                            user_id,
+                            [f for f, _ in to_upload],
+                            caption.strip() if caption else "",
+                            [phash for _, phash in to_upload]
+                        )
+                        st.session_state["photo_upload_nonce"] = upload_nonce + 1
+                        st.rerun()
+
+        render_upload_progress(user_id)
 
     # Display photo gallery
     st.markdown("### THE GALLERY")
@@ -1564,32 +4304,22 @@ def render_photo_wall(user_id: str):
     if photos_df.empty or "uploader" not in photos_df.columns:
         st.info("No photos yet. Be the first to capture a moment!")
     else:
-        # Sort by timestamp (newest first)
-        photos_df = photos_df.sort_values("timestamp", ascending=False)
+        # Newest first
+        photos_df = timeline_of(photos_df).newest_first()
 
         # Display photos
+        like_index = load_photo_likes(photos_df)
+
         for idx, photo in photos_df.iterrows():
-            # Safely get likers
-            likers_raw = photo.get("likers", "") if "likers" in photos_df.columns else ""
-            likers_list = str(likers_raw).split(",") if pd.notna(likers_raw) and likers_raw else []
-            likers_list = [l.strip() for l in likers_list if l.strip()]  # Remove empty strings
-            user_liked = user_id in likers_list
-
-            # Safely convert likes to int
-            like_count = 0
-            if "likes" in photos_df.columns:
-                try:
-                    likes_val = photo.get("likes", 0)
-                    if pd.notna(likes_val) and str(likes_val).strip() != "":
-                        like_count = int(float(likes_val))
-                except (ValueError, TypeError):
-                    like_count = 0
+            photo_id = str(photo["image_url"])
+            user_liked = like_index.has_voted(photo_id, user_id)
+            like_count = like_index.count(photo_id)
 
             st.markdown(f"""
             <div class="card" style="padding: 0.5rem;">
-                <img src="{photo['image_url']}" style="width: 100%; border: 2px solid #1a1a1a;">
+                <img src="{blob_store.variant_url(photo['image_url'], GALLERY_IMAGE_WIDTH) if blob_store else photo['image_url']}" style="width: 100%; border: 2px solid #1a1a1a;">
                 <div style="padding: 0.5rem 0;">
-                    <strong>{photo['uploader']}</strong>
+                    <strong>{photo['uploader']}</strong>{pending_badge(photo)}
                     {f'<br><span style="color: #555555;">{photo["caption"]}</span>' if photo.get('caption') else ''}
                     <br><span style="color: #888888; font-size: 0.75rem;">{photo['timestamp'][:10]}</span>
                     <br><span style="color: #FF6B00; font-weight: bold;">❤️ {like_count}</span>
@@ -1601,10 +4331,8 @@ def render_photo_wall(user_id: str):
             if photo['uploader'] != user_id:
                 if not user_liked:
                     if st.button(f"❤️ Like", key=f"like_photo_{idx}", use_container_width=True):
-                        photos_df.loc[idx, "likes"] = like_count + 1
-                        photos_df.loc[idx, "likers"] = ",".join(likers_list + [user_id])
-                        update_sheet("Photos", photos_df)
-                        st.rerun()
+                        if cast_vote(like_index, PHOTO_LIKES_SHEET, photo_id, user_id):
+                            st.rerun()
                 else:
                     st.caption("You liked this photo.")
 
@@ -1615,12 +4343,87 @@ def render_photo_wall(user_id: str):
 # FEATURE: LEADERBOARD
 # =============================================================================
 
+def score_drinks(ratings_df: pd.DataFrame) -> dict:
+    """{user: {"drinks": line items}} for a Ratings frame - Guinness: +5, Jameson: +5, Other: 0."""
+    contributions = {}
+    if ratings_df.empty or "user_id" not in ratings_df.columns:
+        return contributions
+    for _, rating in ratings_df.iterrows():
+        pub_name = rating.get("pub", "Unknown Pub")
+        drink_type = rating.get("drink_type", "Guinness") if "drink_type" in rating.index else "Guinness"
+        # Handle NaN drink_type
+        if pd.isna(drink_type):
+            drink_type = "Guinness"
+        # Set icon and points based on drink type
+        if drink_type == "Guinness":
+            icon = "🍺"
+            pts = 5
+        elif drink_type == "Jameson":
+            icon = "🥃"
+            pts = 5
+        else:
+            continue
+        contributions.setdefault(rating["user_id"], {}).setdefault("drinks", []).append(
+            {"action": f"{pub_name} ({drink_type})", "points": pts, "icon": icon}
+        )
+    return contributions
+
+def score_fines(inquiries_df: pd.DataFrame) -> dict:
+    """{user: {"fines" | "filed" | "guilty": line items}} for an Inquiries frame."""
+    contributions = {}
+
+    def add(user, category, item):
+        contributions.setdefault(user, {}).setdefault(category, []).append(item)
+
+    if inquiries_df.empty:
+        return contributions
+
+    # New fines format (fined_person column exists)
+    if "fined_person" in inquiries_df.columns:
+        for _, fine in inquiries_df[inquiries_df["fined_person"].notna()].iterrows():
+            rule = str(fine.get("rule_violated", ""))[:30]
+            issuer = fine.get("issuer", "Unknown")
+            add(fine["fined_person"], "fines", {"action": f"Fined by {issuer}: {rule}...", "points": -5, "icon": "💸"})
+
+    # Legacy inquiries (backward compatibility) - only count if old format columns exist
+    if "accused" in inquiries_df.columns:
+        # Old format: Points for inquiries filed (+5 each)
+        if "reporter" in inquiries_df.columns:
+            filed = inquiries_df[inquiries_df["reporter"].notna() & inquiries_df["accused"].notna()]
+            for _, inquiry in filed.iterrows():
+                add(inquiry["reporter"], "filed", {"action": f"Filed inquiry vs {inquiry['accused']}", "points": 5, "icon": "⚖️"})
+
+        # Penalty for being found guilty (-20 each) - legacy only
+        if "guilty_votes" in inquiries_df.columns and "innocent_votes" in inquiries_df.columns:
+            guilty_cases = inquiries_df[
+                inquiries_df["accused"].notna() &
+                (inquiries_df["guilty_votes"] > inquiries_df["innocent_votes"])
+            ]
+            for _, case in guilty_cases.iterrows():
+                rule = str(case.get("rule_violated", ""))[:30]
+                add(case["accused"], "guilty", {"action": f"Found GUILTY: {rule}...", "points": -20, "icon": "🚨"})
+
+    return contributions
+
+def shard_activity(trip_id: str) -> dict:
+    """{user: {category: line items}} from Ratings and Inquiries, merged across day shards.
+
+    Each shard's contribution is memoized, so only shards that changed are rescored.
+    """
+    aggregates = get_shard_aggregates(trip_id)
+    activity = {}
+    for worksheet, compute in (("Ratings", score_drinks), ("Inquiries", score_fines)):
+        for name in ShardedSheet(worksheet, trip_id).names():
+            for user, categories in aggregates.get(name, trip_id, compute).items():
+                for category, items in categories.items():
+                    activity.setdefault(user, {}).setdefault(category, []).extend(items)
+    return activity
+
 def calculate_scores() -> pd.DataFrame:
     """Calculate scores for all users based on all activities."""
     rules_df = load_sheet_data("Rules")
-    inquiries_df = load_sheet_data("Inquiries")
+    activity = shard_activity(get_trip_id())
     bets_df = load_sheet_data("Bets")
-    ratings_df = load_sheet_data("Ratings")
     sidebets_df = load_sheet_data("SideBets")
     mvp_df = load_sheet_data("MVPVotes")
     quotes_df = load_sheet_data("Quotes")
@@ -1628,9 +4431,22 @@ def calculate_scores() -> pd.DataFrame:
 
     # Determine Quote of the Trip winner (submitter of top-voted quote)
     quote_of_trip_submitter = None
-    if not quotes_df.empty and quotes_df["votes"].max() > 0:
-        top_quote = quotes_df.loc[quotes_df["votes"].idxmax()]
-        quote_of_trip_submitter = top_quote["submitter"]
+    if not quotes_df.empty:
+        quote_votes = load_quote_votes(quotes_df).counts(quotes_df["timestamp"])
+        if quote_votes.max() > 0:
+            quote_of_trip_submitter = quotes_df.loc[quote_votes.idxmax(), "submitter"]
+
+    photo_likes = None
+    if not photos_df.empty and "image_url" in photos_df.columns:
+        photo_likes = load_photo_likes(photos_df).counts(photos_df["image_url"])
+
+    settled_sidebets = settled_side_bets(sidebets_df)
+
+    # Each day's MVP, from the per-day nominee tallies
+    mvp_index = get_mvp_index(get_trip_id())
+    mvp_index.sync(mvp_df)
+    mvp_day_counts = mvp_index.day_counts()
+    mvp_winners = {day: mvp_standings(counts)[0][0] for day, counts in mvp_day_counts.items()}
 
     # Get all users
     all_users = set()
@@ -1651,37 +4467,18 @@ def calculate_scores() -> pd.DataFrame:
             line_items.append({"action": "Steward's Rule submitted", "points": 10, "icon": "📜"})
 
         # Points for drinks - Guinness: +5, Jameson: +5, Other: 0
-        if not ratings_df.empty:
-            user_ratings_df = ratings_df[ratings_df["user_id"] == user]
-            if len(user_ratings_df) > 0:
-                drink_points = 0
-                for _, rating in user_ratings_df.iterrows():
-                    pub_name = rating.get("pub", "Unknown Pub")
-                    drink_type = rating.get("drink_type", "Guinness") if "drink_type" in rating.index else "Guinness"
-                    # Handle NaN drink_type
-                    if pd.isna(drink_type):
-                        drink_type = "Guinness"
-                    # Set icon and points based on drink type
-                    if drink_type == "Guinness":
-                        icon = "🍺"
-                        pts = 5
-                    elif drink_type == "Jameson":
-                        icon = "🥃"
-                        pts = 5
-                    else:
-                        icon = "🥤"
-                        pts = 0
-                    score += pts
-                    drink_points += pts
-                    if pts > 0:
-                        line_items.append({"action": f"{pub_name} ({drink_type})", "points": pts, "icon": icon})
-                if drink_points > 0:
-                    breakdown.append(f"Drinks: +{drink_points}")
+        user_activity = activity.get(user, {})
+        drink_items = user_activity.get("drinks", [])
+        if drink_items:
+            drink_points = sum(item["points"] for item in drink_items)
+            score += drink_points
+            line_items.extend(drink_items)
+            breakdown.append(f"Drinks: +{drink_points}")
 
         # Points for betting (wins/losses) - euro-based, with horse names
         if not bets_df.empty:
             user_bets = bets_df[bets_df["user_id"] == user]
-            wins = user_bets[user_bets["result"] == "WIN"]
+            wins = user_bets[user_bets["result"].isin(BET_PAYING_RESULTS)]
             losses = user_bets[user_bets["result"] == "LOSS"]
 
             # Individual winning bets
@@ -1693,12 +4490,13 @@ def calculate_scores() -> pd.DataFrame:
                     race_num = int(bet["race_num"])
                     horse = bet.get("horse", "Unknown")
                     line_items.append({
-                        "action": f"Race {race_num}: {horse} (WIN)",
+                        "action": f"Race {race_num}: {horse} ({bet['result']})",
                         "points": profit,
                         "icon": "🏇"
                     })
                 score += total_profit
-                breakdown.append(f"Bet winnings: +{total_profit}")
+                # An each-way bet that only places can return less than its stake
+                breakdown.append(f"Bet winnings: {total_profit:+d}")
 
             # Individual losing bets
             if len(losses) > 0:
@@ -1716,145 +4514,50 @@ def calculate_scores() -> pd.DataFrame:
                 score -= total_lost
                 breakdown.append(f"Bet losses: -{total_lost}")
 
-        # Points for fines - New fines format
-        if not inquiries_df.empty:
-            # New fines format (fined_person column exists)
-            if 'fined_person' in inquiries_df.columns:
-                user_fines = inquiries_df[inquiries_df["fined_person"] == user]
-                if len(user_fines) > 0:
-                    for _, fine in user_fines.iterrows():
-                        rule = str(fine.get("rule_violated", ""))[:30]
-                        issuer = fine.get("issuer", "Unknown")
-                        score -= 5
-                        line_items.append({
-                            "action": f"Fined by {issuer}: {rule}...",
-                            "points": -5,
-                            "icon": "💸"
-                        })
-                    breakdown.append(f"Fines received: -{len(user_fines) * 5}")
-
-            # Legacy inquiries (backward compatibility) - only count if old format columns exist
-            if 'accused' in inquiries_df.columns:
-                # Old format: Points for inquiries filed (+5 each)
-                filed_inquiries = inquiries_df[inquiries_df.get("reporter", pd.Series()) == user]
-                if len(filed_inquiries) > 0:
-                    for _, inquiry in filed_inquiries.iterrows():
-                        accused = inquiry.get("accused", "Unknown")
-                        if pd.notna(accused):  # Only count if it's old format
-                            score += 5
-                            line_items.append({
-                                "action": f"Filed inquiry vs {accused}",
-                                "points": 5,
-                                "icon": "⚖️"
-                            })
-                    if len(filed_inquiries) > 0:
-                        breakdown.append(f"Inquiries filed: +{len(filed_inquiries) * 5}")
-
-                # Penalty for being found guilty (-20 each) - legacy only
-                if 'guilty_votes' in inquiries_df.columns and 'innocent_votes' in inquiries_df.columns:
-                    guilty_cases = inquiries_df[
-                        (inquiries_df["accused"] == user) &
-                        (inquiries_df["guilty_votes"] > inquiries_df["innocent_votes"])
-                    ]
-                    if len(guilty_cases) > 0:
-                        for _, case in guilty_cases.iterrows():
-                            rule = str(case.get("rule_violated", ""))[:30]
-                            score -= 20
-                            line_items.append({
-                                "action": f"Found GUILTY: {rule}...",
-                                "points": -20,
-                                "icon": "🚨"
-                            })
-                        breakdown.append(f"Guilty verdicts: -{len(guilty_cases) * 20}")
+        # Points for fines, plus legacy inquiries filed and guilty verdicts
+        for category, label, sign in (
+            ("fines", "Fines received", "-"),
+            ("filed", "Inquiries filed", "+"),
+            ("guilty", "Guilty verdicts", "-"),
+        ):
+            items = user_activity.get(category, [])
+            if items:
+                points = sum(item["points"] for item in items)
+                score += points
+                line_items.extend(items)
+                breakdown.append(f"{label}: {sign}{abs(points)}")
 
         # Points for side bets
-        if not sidebets_df.empty:
-            # Bets user created and won
-            user_created_won = sidebets_df[
-                (sidebets_df["creator"] == user) &
-                (sidebets_df["result"] == "WIN")
-            ]
-            for _, bet in user_created_won.iterrows():
-                stake = int(bet["stake"])
-                desc = str(bet["description"])[:30]
-                score += stake
-                line_items.append({
-                    "action": f"Side bet won: {desc}...",
-                    "points": stake,
-                    "icon": "🎲"
-                })
-
-            # Bets user created and lost
-            user_created_lost = sidebets_df[
-                (sidebets_df["creator"] == user) &
-                (sidebets_df["result"] == "LOSS")
-            ]
-            for _, bet in user_created_lost.iterrows():
-                stake = int(bet["stake"])
-                desc = str(bet["description"])[:30]
-                score -= stake
-                line_items.append({
-                    "action": f"Side bet lost: {desc}...",
-                    "points": -stake,
-                    "icon": "🎲"
-                })
-
-            # Bets user took and won (creator lost = taker won)
-            user_took_won = sidebets_df[
-                (sidebets_df["taker"] == user) &
-                (sidebets_df["result"] == "LOSS")
-            ]
-            for _, bet in user_took_won.iterrows():
-                stake = int(bet["stake"])
-                desc = str(bet["description"])[:30]
-                score += stake
-                line_items.append({
-                    "action": f"Side bet won: {desc}...",
-                    "points": stake,
-                    "icon": "🎲"
-                })
-
-            # Bets user took and lost (creator won = taker lost)
-            user_took_lost = sidebets_df[
-                (sidebets_df["taker"] == user) &
-                (sidebets_df["result"] == "WIN")
-            ]
-            for _, bet in user_took_lost.iterrows():
-                stake = int(bet["stake"])
-                desc = str(bet["description"])[:30]
-                score -= stake
-                line_items.append({
-                    "action": f"Side bet lost: {desc}...",
-                    "points": -stake,
-                    "icon": "🎲"
-                })
-
-            # Tally for breakdown
-            total_sb_won = len(user_created_won) + len(user_took_won)
-            total_sb_lost = len(user_created_lost) + len(user_took_lost)
-            if total_sb_won > 0 or total_sb_lost > 0:
-                breakdown.append(f"Side bets: {total_sb_won}W/{total_sb_lost}L")
+        user_sidebets = settled_sidebets[
+            (settled_sidebets["winner"] == user) | (settled_sidebets["loser"] == user)
+        ]
+        sb_won = sb_lost = 0
+        for bet in user_sidebets.itertuples():
+            desc = str(bet.description)[:30]
+            won = bet.winner == user
+            points = int(bet.stake) if won else -int(bet.stake)
+            score += points
+            sb_won += won
+            sb_lost += not won
+            line_items.append({
+                "action": f"Side bet {'won' if won else 'lost'}: {desc}...",
+                "points": points,
+                "icon": "🎲"
+            })
+        if sb_won > 0 or sb_lost > 0:
+            breakdown.append(f"Side bets: {sb_won}W/{sb_lost}L")
 
         # Points for MVP wins (+25 per day)
-        if not mvp_df.empty:
-            # Get all unique days
-            all_days = mvp_df["day"].unique()
-            mvp_wins = 0
-            for day in all_days:
-                day_votes = mvp_df[mvp_df["day"] == day]
-                vote_counts = day_votes.groupby("nominee").size()
-                if not vote_counts.empty:
-                    winner = vote_counts.idxmax()
-                    if winner == user:
-                        mvp_wins += 1
-                        score += 25
-                        line_items.append({
-                            "action": f"MVP Winner: {day}",
-                            "points": 25,
-                            "icon": "⭐"
-                        })
-            if mvp_wins > 0:
-                breakdown.append(f"MVP wins: +{mvp_wins * 25}")
+        mvp_days = [day for day, winner in mvp_winners.items() if winner == user]
+        for day in mvp_days:
+            score += 25
+            line_items.append({
+                "action": f"MVP Winner: {day}",
+                "points": 25,
+                "icon": "⭐"
+            })
+        if mvp_days:
+            breakdown.append(f"MVP wins: +{len(mvp_days) * 25}")
 
         # Points for Quote of the Trip (+25)
         if quote_of_trip_submitter == user:
@@ -1880,14 +4583,7 @@ def calculate_scores() -> pd.DataFrame:
                 })
 
                 # Count likes received
-                total_likes = 0
-                if "likes" in photos_df.columns:
-                    for _, photo in user_photos.iterrows():
-                        try:
-                            likes = int(photo["likes"]) if pd.notna(photo.get("likes")) and str(photo["likes"]).strip() != "" else 0
-                        except (ValueError, TypeError):
-                            likes = 0
-                        total_likes += likes
+                total_likes = int(photo_likes[user_photos.index].sum()) if photo_likes is not None else 0
 
                 if total_likes > 0:
                     score += total_likes
@@ -1908,6 +4604,191 @@ def calculate_scores() -> pd.DataFrame:
 
     return pd.DataFrame(scores).sort_values("score", ascending=False).reset_index(drop=True)
 
+# =============================================================================
+# STANDINGS PROJECTION
+# =============================================================================
+
+PROJECTION_BATCH = 2000
+PROJECTION_MAX_SIMS = 20000
+PROJECTION_TIME_BUDGET = 0.25  # seconds
+
+def _race_distributions(exposures: list, racecard: Optional[Racecard]) -> dict:
+    """Win probabilities per race over every runner anyone has exposure to.
+
+    exposures holds (race_num, horse_key, num, den) for pending bets/legs. With
+    a racecard the whole field is priced from the card. Implied probabilities
+    are normalized to remove the overround; if they sum to less than one, the
+    remainder goes to an unbacked "field" outcome.
+    """
+    races = {}
+    if racecard:
+        for race_num in {race for race, _, _, _ in exposures}:
+            for runner in racecard.runners(race_num):
+                if runner["odds"]:
+                    races.setdefault(race_num, {})[f"#{runner['no']}"] = implied_probability(*runner["odds"])
+    for race_num, key, num, den in exposures:
+        races.setdefault(race_num, {}).setdefault(key, implied_probability(num, den))
+
+    distributions = {}
+    for race_num, runners in races.items():
+        keys = list(runners)
+        probabilities = np.array([runners[key] for key in keys], dtype=float)
+        total = probabilities.sum()
+        if total < 1:
+            keys.append(None)
+            probabilities = np.append(probabilities, 1 - total)
+        distributions[race_num] = (keys, probabilities / probabilities.sum())
+    return distributions
+
+@st.cache_data(ttl=30, show_spinner=False)
+def project_standings(current: pd.DataFrame, bets_df: pd.DataFrame, sidebets_df: pd.DataFrame) -> pd.DataFrame:
+    """Monte Carlo projection of final standings from pending race bets and open side bets.
+
+    Each simulation draws one winner per race with pending exposure (so bets on
+    the same race are correctly exclusive), settles every pending bet and open
+    side bet, and adds the score swings to the current scores. Simulations run
+    in vectorized batches until PROJECTION_MAX_SIMS or the time budget is hit.
+
+    Returns user, score, expected (mean final score), p_first, sims.
+    """
+    users = list(current["user"])
+    user_index = {user: i for i, user in enumerate(users)}
+    racecard = get_racecard()
+
+    # Race bets: (user column, race, horse key, each-way place chance, win/place/lose score deltas)
+    bets = []
+    acca_legs = []
+    exposures = []
+    if not bets_df.empty:
+        pending = bets_df[(bets_df["result"] == "PENDING") & bets_df["user_id"].isin(user_index)]
+        if not pending.empty:
+            stake_cents, num, den, each_way, places, place_fraction = _bet_terms(pending)
+            ones = pd.Series(True, index=pending.index)
+            zeros = ~ones
+            win_payout = payout_cents(stake_cents, num, den, each_way, place_fraction, ones, ones) / 100
+            place_payout = payout_cents(stake_cents, num, den, each_way, place_fraction, zeros, ones) / 100
+            stakes = stake_cents / 100
+            bet_types = _bet_column(pending, "bet_type", "WIN")
+            runner_nos = _bet_column(pending, "runner_no", "")
+
+            for idx in pending.index:
+                user_col = user_index[pending.at[idx, "user_id"]]
+                # Scores count whole points, as in calculate_scores
+                win_delta = int(win_payout[idx] - stakes[idx])
+                lose_delta = -int(stakes[idx])
+                if bet_types[idx] == "ACCA":
+                    legs = []
+                    for leg in parse_acca_legs(pending.at[idx, "legs"]):
+                        if leg.get("result", "PENDING") == "PENDING":
+                            race = int(leg["race_num"])
+                            key = _horse_key(leg["horse"], leg.get("runner_no", ""), race, racecard)
+                            legs.append((race, key))
+                            exposures.append((race, key, *leg["odds"]))
+                    acca_legs.append((user_col, legs, win_delta, lose_delta))
+                    continue
+
+                race = int(pd.to_numeric(pending.at[idx, "race_num"], errors="coerce"))
+                key = _horse_key(pending.at[idx, "horse"], runner_nos[idx], race, racecard)
+                exposures.append((race, key, num[idx], den[idx]))
+                place_delta = int(place_payout[idx] - stakes[idx]) if each_way[idx] else lose_delta
+                bets.append((user_col, race, key, bool(each_way[idx]), int(places[idx]), win_delta, place_delta, lose_delta))
+
+    side_bets = []
+    if not sidebets_df.empty:
+        open_bets = sidebets_df[
+            (sidebets_df["result"] == "OPEN")
+            & sidebets_df["creator"].isin(user_index)
+            & sidebets_df["taker"].isin(user_index)
+        ]
+        for creator, taker, stake in zip(open_bets["creator"], open_bets["taker"], open_bets["stake"]):
+            side_bets.append((user_index[creator], user_index[taker], int(stake)))
+
+    distributions = _race_distributions(exposures, racecard)
+    rng = np.random.default_rng()
+    base = current["score"].to_numpy(dtype=float)
+    n_users = len(users)
+    firsts = np.zeros(n_users)
+    totals = np.zeros(n_users)
+    sims = 0
+    started = time.perf_counter()
+
+    while sims < PROJECTION_MAX_SIMS:
+        n = PROJECTION_BATCH
+        deltas = np.zeros((n, n_users))
+
+        # One winner per race per simulation
+        winners = {
+            race: rng.choice(len(keys), size=n, p=probabilities)
+            for race, (keys, probabilities) in distributions.items()
+        }
+        key_positions = {race: {key: i for i, key in enumerate(keys)} for race, (keys, _) in distributions.items()}
+
+        for user_col, race, key, each_way, places, win_delta, place_delta, lose_delta in bets:
+            position = key_positions[race][key]
+            won = winners[race] == position
+            if each_way:
+                # Approximate place chance for the non-winners: (places - 1) slots among the rest of the field
+                p = distributions[race][1][position]
+                place_chance = min(1.0, (places - 1) * p / max(1 - p, 1e-9))
+                placed = ~won & (rng.random(n) < place_chance)
+                deltas[:, user_col] += np.where(won, win_delta, np.where(placed, place_delta, lose_delta))
+            else:
+                deltas[:, user_col] += np.where(won, win_delta, lose_delta)
+
+        for user_col, legs, win_delta, lose_delta in acca_legs:
+            won = np.ones(n, dtype=bool)
+            for race, key in legs:
+                won &= winners[race] == key_positions[race][key]
+            deltas[:, user_col] += np.where(won, win_delta, lose_delta)
+
+        for creator_col, taker_col, stake in side_bets:
+            swing = np.where(rng.random(n) < 0.5, stake, -stake)
+            deltas[:, creator_col] += swing
+            deltas[:, taker_col] -= swing
+
+        finals = base + deltas
+        # Scores are whole points, so sub-point jitter only breaks ties (at random)
+        leaders = np.argmax(finals + rng.random(finals.shape) * 1e-3, axis=1)
+        firsts += np.bincount(leaders, minlength=n_users)
+        totals += finals.sum(axis=0)
+        sims += n
+
+        if time.perf_counter() - started > PROJECTION_TIME_BUDGET:
+            break
+
+    return pd.DataFrame({
+        "user": users,
+        "score": base,
+        "expected": totals / sims,
+        "p_first": firsts / sims,
+        "sims": sims
+    }).sort_values(["p_first", "expected"], ascending=False).reset_index(drop=True)
+
+def render_projection(scores_df: pd.DataFrame):
+    """Render projected finishing odds from pending bets."""
+    bets_df = load_sheet_data("Bets")
+    sidebets_df = load_sheet_data("SideBets")
+    has_pending = (
+        (not bets_df.empty and (bets_df["result"] == "PENDING").any())
+        or (not sidebets_df.empty and (sidebets_df["result"] == "OPEN").any())
+    )
+    if not has_pending:
+        return
+
+    with st.expander("PROJECTIONS", expanded=False):
+        projection = project_standings(scores_df[["user", "score"]], bets_df, sidebets_df)
+        st.caption(
+            f"{int(projection['sims'].iloc[0]):,} simulations of pending race bets (at the odds' implied chances) "
+            "and open side bets (50/50)."
+        )
+        for _, row in projection.iterrows():
+            st.markdown(f"""
+            <div class="leader-row">
+                <span class="leader-name">{row['user']}</span>
+                <span>{row['p_first']:.0%} to win | ~{row['expected']:.0f} pts</span>
+            </div>
+            """, unsafe_allow_html=True)
+
 def render_leaderboard():
     """Render the live leaderboard."""
     scores_df = calculate_scores()
@@ -1938,6 +4819,8 @@ def render_leaderboard():
         - **❤️ Photo like received:** +1 pt
         """)
 
+    render_projection(scores_df)
+
     st.markdown("")
 
     # Display leaderboard
@@ -1994,12 +4877,205 @@ def render_leaderboard():
             else:
                 st.caption("No activity yet.")
 
+# =============================================================================
+# SEARCH
+# =============================================================================
+
+# sheet: (text column, person column, label, icon)
+SEARCH_SOURCES = {
+    "Quotes": ("quote", "speaker", "Quote", "💬"),
+    "Inquiries": ("evidence", "fined_person", "Fine", "💸"),
+    "Rules": ("rule", "user_id", "Rule", "📜"),
+    "Photos": ("caption", "uploader", "Photo", "📸"),
+}
+SEARCH_PERSON_WEIGHT = 0.5  # a name on the row counts half a mention in the text
+SEARCH_PREFIX_WEIGHT = 0.5  # a prefix match counts half an exact term match
+SEARCH_MAX_EXPANSIONS = 50  # terms a prefix may expand to
+SEARCH_LIMIT = 25
+
+def search_tokens(text) -> list:
+    """Lowercase ASCII words of a text, apostrophes dropped ("Dom's" -> "doms")."""
+    if pd.isna(text):
+        return []
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode().lower()
+    text = re.sub(r"['’]", "", text)
+    return re.findall(r"[a-z0-9]+", text)
+
+class SearchIndex:
+    """Incremental inverted index over the free-text columns of several sheets.
+
+    Documents are worksheet rows, identified by (worksheet, position). A sync
+    is skipped while the worksheet's revision is unchanged, and otherwise
+    tokenizes only the rows appended since. Terms are also kept in a sorted
+    list, so a prefix expands by binary search; results are ranked by how
+    many query words matched, then by tf-idf.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revisions = {}
+        self._rows_seen = {}
+        self._docs = {}
+        self._doc_terms = {}
+        self._postings = {}
+        self._terms = []
+
+    def _remove(self, doc_id):
+        self._docs.pop(doc_id, None)
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect.bisect_left(self._terms, term)]
+
+    def _add(self, doc_id, doc: dict):
+        weights = Counter(search_tokens(doc["text"]))
+        for token in search_tokens(doc["person"]):
+            weights[token] += SEARCH_PERSON_WEIGHT
+        if not weights:
+            return
+        self._docs[doc_id] = doc
+        self._doc_terms[doc_id] = weights
+        for term, weight in weights.items():
+            if term not in self._postings:
+                self._postings[term] = {}
+                bisect.insort(self._terms, term)
+            self._postings[term][doc_id] = weight
+
+    def sync(self, sheet: str, name: str, trip_id: str):
+        """Index the rows of one worksheet (a sheet or one of its day shards) written since the last sync.
+
+        Skipped without loading the worksheet while its revision is unchanged,
+        and left for the next sync if the read failed or was stale. Append-only
+        sheets index just their new rows; the rest are reindexed.
+        """
+        revision = sheet_revision(name, trip_id)
+        with self._lock:
+            if self._revisions.get(name) == revision:
+                return
+        loaded = load_sheet_data(name, trip_id=trip_id)
+        if loaded.attrs.get("stale"):
+            return
+        # Pending rows are left out - their positions aren't settled until they commit
+        df = committed_rows(loaded)
+        settled = sheet_revision(name, trip_id) == revision  # unchanged while loading
+        text_col, person_col, _, _ = SEARCH_SOURCES[sheet]
+
+        with self._lock:
+            seen = self._rows_seen.get(name, 0)
+            if sheet not in APPEND_ONLY_SHEETS or len(df) < seen:
+                # Edited in place, or cleared - start this worksheet again
+                for position in range(seen):
+                    self._remove((name, position))
+                seen = 0
+            if text_col in df.columns:
+                new_rows = df.iloc[seen:]
+                people = new_rows[person_col] if person_col in df.columns else [None] * len(new_rows)
+                timestamps = new_rows["timestamp"].astype(str) if "timestamp" in df.columns else [""] * len(new_rows)
+                for position, (text, person, timestamp) in enumerate(zip(new_rows[text_col], people, timestamps), seen):
+                    self._add((name, position), {
+                        "sheet": sheet,
+                        "text": text,
+                        "person": person,
+                        "timestamp": timestamp
+                    })
+            self._rows_seen[name] = len(df)
+            if settled:
+                self._revisions[name] = revision
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> list:
+        """Best-matching documents for a query; every word also matches as a prefix."""
+        scores = Counter()
+        matched = Counter()
+        with self._lock:
+            total = len(self._docs)
+            for token in dict.fromkeys(search_tokens(query)):
+                hits = {}
+                start = bisect.bisect_left(self._terms, token)
+                for term in self._terms[start:start + SEARCH_MAX_EXPANSIONS]:
+                    if not term.startswith(token):
+                        break
+                    postings = self._postings[term]
+                    idf = np.log1p(total / len(postings))
+                    boost = 1.0 if term == token else SEARCH_PREFIX_WEIGHT
+                    for doc_id, weight in postings.items():
+                        hits[doc_id] = max(hits.get(doc_id, 0.0), weight * idf * boost)
+                for doc_id, score in hits.items():
+                    scores[doc_id] += score
+                    matched[doc_id] += 1
+            ranked = sorted(scores, key=lambda d: (-matched[d], -scores[d], self._docs[d]["timestamp"]))
+            return [self._docs[doc_id] for doc_id in ranked[:limit]]
+
+@st.cache_resource
+def get_search_index(trip_id: str):
+    """A trip's search index, shared by all of its sessions."""
+    return SearchIndex()
+
+def search_trip(query: str) -> list:
+    """Search every indexed sheet, syncing each with its latest rows first."""
+    trip_id = get_trip_id()
+    index = get_search_index(trip_id)
+    for sheet in SEARCH_SOURCES:
+        for name in ShardedSheet(sheet, trip_id).names():
+            index.sync(sheet, name, trip_id)
+    return index.search(query)
+
+def render_search():
+    """Render the search tab - find quotes, fines, rules and captions."""
+    st.markdown("## SEARCH")
+    st.markdown("*Find that quote about the taxi*")
+    st.markdown("---")
+
+    query = st.text_input(
+        "Search quotes, fines, rules and captions:",
+        placeholder="e.g., taxi, dom, guinn...",
+        key="search_query"
+    )
+    if not query or not search_tokens(query):
+        st.info("Type a word, a name or the start of one.")
+        return
+
+    results = search_trip(query)
+    if not results:
+        st.info(f"Nothing found for '{query}'.")
+        return
+
+    st.caption(f"{len(results)} result{'s' if len(results) != 1 else ''}")
+    for doc in results:
+        _, _, label, icon = SEARCH_SOURCES[doc["sheet"]]
+        person = f" — {doc['person']}" if doc["person"] and pd.notna(doc["person"]) else ""
+        st.markdown(f"""
+        <div class="card">
+            <span style="color: #888888; font-size: 0.75rem;">{icon} {label.upper()} · {doc['timestamp'][:10]}</span><br>
+            <span style="font-size: 1.05rem;">{doc['text']}</span>
+            <span style="color: #555555;">{person}</span>
+        </div>
+        """, unsafe_allow_html=True)
+
 # =============================================================================
 # MAIN APP
 # =============================================================================
 
 def main():
     """Main app entry point."""
+    # Unknown trip in the URL - never fall back to another trip's data
+    if requested_trip_id() and requested_trip_id() not in get_trips():
+        render_logo()
+        st.error(f"No trip called '{requested_trip_id()}'. Check the link you were sent.")
+        return
+
+    # A new trip's worksheets are created on its first visit
+    try:
+        ensure_trip_worksheets(get_trip_id())
+    except Exception as e:
+        render_logo()
+        st.error(
+            f"{get_trip()['name']} isn't set up yet: its worksheets couldn't be created ({e}). "
+            "Give the app's service account edit access to the trip's spreadsheet, or add the worksheets by hand."
+        )
+        return
+
     # Get current user from session state
     user_id = get_current_user()
 
@@ -2026,13 +5102,15 @@ def main():
         if st.button("Logout", key="logout_btn"):
             del st.session_state["authenticated_user"]
             del st.session_state["seen_intro"]
+            st.session_state.pop("authenticated_trip", None)
             st.rerun()
 
     # Main app navigation
     render_header()
+    render_sync_status()
 
     # ADMIN ONLY: Clear all data button
-    if user_id == "James":
+    if is_trip_admin(user_id):
         st.markdown("---")
         st.markdown("### ADMIN CONTROLS")
         if st.button("🚨 CLEAR ALL DATA (ADMIN)", use_container_width=True):
@@ -2041,11 +5119,11 @@ def main():
 
     # Manual refresh button to avoid rate limits
     if st.button("REFRESH DATA", use_container_width=True):
-        st.cache_data.clear()
+        refresh_trip_data()
         st.rerun()
 
     # Tab navigation
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10 = st.tabs([
         "RULES",
         "FINES",
         "BETS",
@@ -2054,7 +5132,8 @@ def main():
         "SIDE BETS",
         "MVP",
         "PHOTOS",
-        "SCORES"
+        "SCORES",
+        "SEARCH"
     ])
 
     with tab1:
@@ -2094,5 +5173,8 @@ def main():
     with tab9:
         render_leaderboard()
 
+    with tab10:
+        render_search()
+
 if __name__ == "__main__":
     main()